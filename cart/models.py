@@ -24,7 +24,7 @@ class Cart(object):
         """
         Add a product to the cart or update its quantity.
         """
-        if product.barcode in self.cart.keys():
+        if product.barcode in self.cart:
            self.cart[product.barcode]['quantity'] += quantity
            if self.cart[product.barcode]['quantity'] == 0:
                 self.remove(product)
@@ -0,0 +1,7 @@
+from .devlopement import *
+from django.conf import global_settings
+
+# Fast password hasher for test runs; PBKDF2 dominates user setup in tests.
+# The default hashers stay listed after it so existing hashes still verify.
+# Run Django's test runner with: SETTINGS=iretilightpos.settings.test python manage.py test
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher', *global_settings.PASSWORD_HASHERS]
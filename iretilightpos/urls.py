@@ -88,7 +88,9 @@ urlpatterns = [
         
         # Stripe Payment URLs
         path('start-stripe-payment/', transaction_views.start_stripe_payment, name='start_stripe_payment'),
+        path('stripe-payment-intent/<transNo>/', transaction_views.stripe_payment_intent, name='stripe_payment_intent'),
         path('complete-stripe-payment/<transNo>/', transaction_views.complete_stripe_payment, name='complete_stripe_payment'),
+        path('stripe-payment-status/<transNo>/', transaction_views.stripe_payment_status, name='stripe_payment_status'),
 
         # Customer Screen URLs
         path("retail_display/",views.retail_display,name="retail_display"),
@@ -42,8 +42,9 @@ def register(request):
     # Compute cart totals from session (safe defaults)
     try:
         cart = request.session[settings.CART_SESSION_ID]
-        Total = round(pd.DataFrame(cart).T["line_total"].astype(float).sum(), 2)
-        Tax_Total = round(pd.DataFrame(cart).T["tax_value"].astype(float).sum(), 2)
+        totals = pd.DataFrame(cart).T[["line_total", "tax_value"]].astype(float).sum()
+        Total = round(totals["line_total"], 2)
+        Tax_Total = round(totals["tax_value"], 2)
     except KeyError:
         cart = {}
         Total = 0.0
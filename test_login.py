@@ -31,9 +31,11 @@ async def test_login():
             print("Screenshot saved as login_page.png")
             
             # Look for login form elements
-            username_field = await page.query_selector('input[name="username"]')
-            password_field = await page.query_selector('input[name="password"]')
-            login_button = await page.query_selector('input[type="submit"], button[type="submit"], button:has-text("Login")')
+            username_field, password_field, login_button = await asyncio.gather(
+                page.query_selector('input[name="username"]'),
+                page.query_selector('input[name="password"]'),
+                page.query_selector('input[type="submit"], button[type="submit"], button:has-text("Login")'),
+            )
             
             if username_field and password_field and login_button:
                 print("Login form found! Attempting to login...")
@@ -62,15 +64,16 @@ async def test_login():
                 if '/user/login' not in new_url:
                     print("✅ LOGIN SUCCESSFUL! Redirected away from login page")
                     
-                    # Look for dashboard or welcome elements
-                    welcome_element = await page.query_selector('text="Welcome"')
-                    dashboard_element = await page.query_selector('text="Dashboard"')
+                    # Look for dashboard or welcome elements and get page title
+                    welcome_element, dashboard_element, title = await asyncio.gather(
+                        page.query_selector('text="Welcome"'),
+                        page.query_selector('text="Dashboard"'),
+                        page.title(),
+                    )
                     
                     if welcome_element or dashboard_element:
                         print("✅ Found welcome/dashboard elements")
                     
-                    # Get page title
-                    title = await page.title()
                     print(f"Page title: {title}")
                     
                 else:
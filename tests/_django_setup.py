@@ -0,0 +1,23 @@
+"""
+Django setup shared by tests/conftest.py and the scripts' __main__ runners.
+
+pytest loads conftest.py before collecting anything; scripts run directly
+with ``python tests/unit/<script>.py`` call setup_django() themselves.
+"""
+
+import os
+import sys
+
+import django
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django():
+    """Put the project root on sys.path, resolve the test settings and run django.setup()."""
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iretilightpos.settings.test')
+    # Skip the Stripe key validation in base settings when keys aren't configured
+    os.environ.setdefault('DJANGO_TESTING', '1')
+    django.setup()
@@ -0,0 +1,19 @@
+"""
+Shared pytest setup for the scripts under tests/.
+
+Resolves the Django settings module once and runs django.setup() before
+any test module is imported, so individual scripts don't each configure
+Django with their own (sometimes conflicting) settings module. The
+project root goes on sys.path here too, so the tests/legacy aliases can
+import tests.unit / tests.integration wherever pytest is invoked from.
+"""
+
+import os
+import sys
+
+# Make the project root importable regardless of where pytest is invoked from
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests._django_setup import setup_django
+
+setup_django()
@@ -9,45 +9,95 @@ import json
 import hashlib
 import hmac
 import time
+from functools import lru_cache
 
-# Set up Django environment for integration tests
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iretilightpos.settings')
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-import django
-django.setup()
+if __name__ == '__main__':
+    # Run directly rather than under pytest: configure Django as tests/conftest.py does
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from tests._django_setup import setup_django
+    setup_django()
 
 from django.test import Client
 from django.conf import settings
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+# Fields shared by every test event; per-event fields are filled in by create_test_event
+_EVENT_TEMPLATE = {
+    "object": "event",
+    "api_version": "2024-06-20",
+    "livemode": False,
+    "pending_webhooks": 1,
+}
+
+# HMAC pad translation tables (RFC 2104), as used by the stdlib hmac module
+_TRANS_5C = bytes((x ^ 0x5C) for x in range(256))
+_TRANS_36 = bytes((x ^ 0x36) for x in range(256))
+
+@lru_cache(maxsize=8)
+def _stripe_sig_pads(secret: bytes):
+    """Return the keyed inner/outer HMAC-SHA256 states for a webhook secret."""
+    block_size = hashlib.sha256().block_size
+    if len(secret) > block_size:
+        secret = hashlib.sha256(secret).digest()
+    secret = secret.ljust(block_size, b'\0')
+    return hashlib.sha256(secret.translate(_TRANS_36)), hashlib.sha256(secret.translate(_TRANS_5C))
+
+def _fast_stripe_sig(secret_pads, timestamp: int, payload_bytes: bytes) -> str:
+    """Build a Stripe-Signature header from precomputed pads, bypassing hmac.HMAC."""
+    inner_pad, outer_pad = secret_pads
+    inner = inner_pad.copy()
+    inner.update(b"%d." % timestamp + payload_bytes)
+    outer = outer_pad.copy()
+    outer.update(inner.digest())
+    return f"t={timestamp},v1={outer.hexdigest()}"
+
 class WebhookTester:
     def __init__(self):
         self.client = Client()
         self.webhook_secret = getattr(settings, 'STRIPE_WEBHOOK_SECRET', 'whsec_test')
+        self._secret_bytes = self.webhook_secret.encode('utf-8')
+        # The secret is fixed, so key the inner/outer SHA-256 states once and
+        # copy them per signature instead of re-expanding the key every call
+        self._secret_pads = _stripe_sig_pads(self._secret_bytes)
+
+    def create_webhook_signature(self, payload_bytes: bytes, timestamp: int = None) -> str:
+        """Build a Stripe-Signature header for payload_bytes.
 
-    def create_webhook_signature(self, payload: str, timestamp: int = None) -> str:
+        Used only for test-harness signing; verification must use
+        hmac.compare_digest (see verify_signature).
+        """
         if timestamp is None:
             timestamp = int(time.time())
-        signed_payload = f"{timestamp}.{payload}"
-        signature = hmac.new(
-            self.webhook_secret.encode('utf-8'),
-            signed_payload.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        return f"t={timestamp},v1={signature}"
+        return _fast_stripe_sig(self._secret_pads, timestamp, payload_bytes)
+
+    def verify_signature(self, payload_bytes: bytes, header: str) -> bool:
+        """Check a Stripe-Signature header against payload_bytes in constant time."""
+        try:
+            parts = dict(item.split('=', 1) for item in header.split(','))
+            timestamp = int(parts['t'])
+            received = parts['v1']
+        except (KeyError, ValueError):
+            return False
+        expected = hmac.digest(self._secret_bytes, b"%d." % timestamp + payload_bytes, 'sha256').hex()
+        return hmac.compare_digest(expected, received)
 
     def create_test_event(self, event_type: str, event_data: dict) -> dict:
-        return {
-            "id": f"evt_test_{int(time.time())}",
-            "object": "event",
-            "api_version": "2024-06-20",
-            "created": int(time.time()),
-            "data": {"object": event_data},
-            "livemode": False,
-            "pending_webhooks": 1,
-            "request": {"id": f"req_test_{int(time.time())}", "idempotency_key": None},
-            "type": event_type
-        }
+        now = int(time.time())
+        event = _EVENT_TEMPLATE.copy()
+        event.update(
+            id=f"evt_test_{now}",
+            created=now,
+            data={"object": event_data},
+            request={"id": f"req_test_{now}", "idempotency_key": None},
+            type=event_type,
+        )
+        return event
 
     def test_payment_intent_succeeded(self):
         payment_intent_data = {
@@ -61,9 +111,11 @@ class WebhookTester:
             "metadata": {"test_webhook": "true"}
         }
         event = self.create_test_event("payment_intent.succeeded", payment_intent_data)
-        payload = json.dumps(event)
-        signature = self.create_webhook_signature(payload)
-        response = self.client.post('/payments/webhook/', data=payload, content_type='application/json', HTTP_STRIPE_SIGNATURE=signature)
+        payload_bytes = _dumps(event)
+        signature = self.create_webhook_signature(payload_bytes)
+        if not self.verify_signature(payload_bytes, signature):
+            return False
+        response = self.client.post('/payments/webhook/', data=payload_bytes, content_type='application/json', HTTP_STRIPE_SIGNATURE=signature)
         return response.status_code == 200
 
 if __name__ == '__main__':
@@ -1,6 +1,9 @@
-#!/usr/bin/env python
-"""
-Simple API test for payment endpoints. (legacy copy)
-"""
+"""Legacy alias - see tests/unit/test_api_simple.py."""
+import os
 
-...existing code...
+import pytest
+
+if not os.environ.get('RUN_LEGACY_TESTS'):
+    pytest.skip('legacy alias of tests/unit; set RUN_LEGACY_TESTS=1 to collect it', allow_module_level=True)
+
+from tests.unit.test_api_simple import *  # noqa: F401,F403
@@ -1,37 +1,9 @@
-#!/usr/bin/env python3
-"""
-Legacy copy of test_payment_ui
-"""
-
-...existing code...
-#!/usr/bin/env python
-"""
-Legacy copy: Test script for Payment UI Components.
-"""
-
+"""Legacy alias - see tests/unit/test_payment_ui.py."""
 import os
-import sys
-import django
-
-# Set environment variables
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iretilightpos.settings.devlopement')
-os.environ.setdefault('STRIPE_SECRET_KEY', 'sk_test_placeholder')
-os.environ.setdefault('STRIPE_PUBLISHABLE_KEY', 'pk_test_placeholder')
-os.environ.setdefault('STRIPE_WEBHOOK_SECRET', 'whsec_placeholder')
-
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-django.setup()
 
-from django.test import Client
-from django.contrib.auth.models import User
-import json
+import pytest
 
-def test_payment_ui_views():
-    print("Testing Payment UI Views (legacy copy)")
-    client = Client()
-    # simplified checks
-    return True
+if not os.environ.get('RUN_LEGACY_TESTS'):
+    pytest.skip('legacy alias of tests/unit; set RUN_LEGACY_TESTS=1 to collect it', allow_module_level=True)
 
-if __name__ == '__main__':
-    success = test_payment_ui_views()
-    sys.exit(0 if success else 1)
+from tests.unit.test_payment_ui import *  # noqa: F401,F403
@@ -1,21 +1,9 @@
-#!/usr/bin/env python3
-"""
-Legacy copy of test_stripe_direct
-"""
-
-...existing code...
-#!/usr/bin/env python
-"""
-Legacy direct Stripe API Test
-"""
-
+"""Legacy alias - see tests/unit/test_stripe_direct.py."""
 import os
-from pathlib import Path
-from dotenv import load_dotenv
-import requests
 
-project_root = Path(__file__).parent
-load_dotenv(project_root / '.env')
+import pytest
+
+if not os.environ.get('RUN_LEGACY_TESTS'):
+    pytest.skip('legacy alias of tests/unit; set RUN_LEGACY_TESTS=1 to collect it', allow_module_level=True)
 
-stripe_secret = os.getenv('STRIPE_SECRET_KEY')
-print("Legacy Stripe direct test placeholder - does not run by default")
+from tests.unit.test_stripe_direct import *  # noqa: F401,F403
@@ -1,26 +1,9 @@
-#!/usr/bin/env python
-"""
-Legacy copy of test_stripe_quick
-"""
-
-...existing code...
-#!/usr/bin/env python
-"""
-Legacy quick stripe test (simplified).
-"""
+"""Legacy alias - see tests/unit/test_stripe_quick.py."""
 import os
-import sys
-import django
-from pathlib import Path
 
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iretilightpos.settings.devlopement')
-os.environ['DJANGO_TESTING'] = '1'
+import pytest
 
-try:
-    django.setup()
-except Exception:
-    pass
+if not os.environ.get('RUN_LEGACY_TESTS'):
+    pytest.skip('legacy alias of tests/unit; set RUN_LEGACY_TESTS=1 to collect it', allow_module_level=True)
 
-print('Legacy quick stripe test placeholder')
+from tests.unit.test_stripe_quick import *  # noqa: F401,F403
@@ -1,11 +1,9 @@
-#!/usr/bin/env python3
-"""
-Legacy copy of test_stripe_service
-"""
+"""Legacy alias - see tests/unit/test_stripe_service.py."""
+import os
 
-...existing code...
-#!/usr/bin/env python
-"""
-Legacy stripe service tests (placeholder).
-"""
-print('Legacy stripe service tests preserved here')
+import pytest
+
+if not os.environ.get('RUN_LEGACY_TESTS'):
+    pytest.skip('legacy alias of tests/unit; set RUN_LEGACY_TESTS=1 to collect it', allow_module_level=True)
+
+from tests.unit.test_stripe_service import *  # noqa: F401,F403
@@ -1,5 +1,9 @@
-#!/usr/bin/env python
-"""
-Legacy simple stripe tests.
-"""
-print('Legacy simple stripe tests placeholder')
+"""Legacy alias - see tests/unit/test_stripe_simple.py."""
+import os
+
+import pytest
+
+if not os.environ.get('RUN_LEGACY_TESTS'):
+    pytest.skip('legacy alias of tests/unit; set RUN_LEGACY_TESTS=1 to collect it', allow_module_level=True)
+
+from tests.unit.test_stripe_simple import *  # noqa: F401,F403
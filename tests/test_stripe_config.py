@@ -15,10 +15,48 @@ sys.path.insert(0, '/workspaces/ireti-pos-light')
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iretilightpos.settings.devlopement')
 django.setup()
 
+import hashlib
+import time
 import stripe
 from django.conf import settings
 from decimal import Decimal
 
+# Share one keep-alive requests.Session across the Account/PaymentIntent calls
+# so they reuse a single TCP+TLS connection to api.stripe.com.
+stripe.default_http_client = stripe.http_client.RequestsClient()
+
+# Successful live checks are remembered for a day so re-running the script
+# after no config change skips the Stripe API round-trips.
+VERIFIED_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'ireti', 'stripe_config.ok')
+VERIFIED_CACHE_TTL = 24 * 60 * 60
+
+
+def _key_fingerprint():
+    """Fingerprint the secret key together with the Stripe library version."""
+    return hashlib.sha256((settings.STRIPE_SECRET_KEY + stripe.VERSION).encode()).hexdigest()
+
+
+def _is_verified(key_fp):
+    """Return True if the live checks already passed for this fingerprint recently."""
+    try:
+        with open(VERIFIED_CACHE_FILE, 'r') as f:
+            cached_fp, verified_at = f.read().split()
+        return cached_fp == key_fp and time.time() - float(verified_at) < VERIFIED_CACHE_TTL
+    except (OSError, ValueError):
+        return False
+
+
+def _mark_verified(key_fp):
+    """Record a successful live check, writing the cache file atomically."""
+    try:
+        os.makedirs(os.path.dirname(VERIFIED_CACHE_FILE), exist_ok=True)
+        tmp_file = f"{VERIFIED_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w') as f:
+            f.write(f"{key_fp} {time.time()}\n")
+        os.replace(tmp_file, VERIFIED_CACHE_FILE)
+    except OSError:
+        pass
+
 def test_stripe_config():
     """Test Stripe configuration and basic functionality."""
     
@@ -53,6 +91,12 @@ def test_stripe_config():
     else:
         print("   ✅ Publishable key is a test key")
     
+    key_fp = _key_fingerprint()
+    if _is_verified(key_fp):
+        print("\n✅ Stripe API connection already verified for this key (cached)")
+        print(f"   🗂️  Delete {VERIFIED_CACHE_FILE} to force a live check")
+        return True
+    
     # Set Stripe API key
     stripe.api_key = settings.STRIPE_SECRET_KEY
     
@@ -95,6 +139,8 @@ def test_stripe_config():
         print(f"   ❌ Payment intent creation failed: {e}")
         return False
     
+    _mark_verified(key_fp)
+    
     print("\n5. Testing common Stripe test cards...")
     test_cards = [
         {'number': '4242424242424242', 'brand': 'Visa', 'description': 'Successful payment'},
@@ -6,20 +6,23 @@ Tests the complete flow from cart to payment completion.
 import pytest
 import asyncio
 from playwright.async_api import async_playwright, Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 import json
-import time
 from django.contrib.auth.models import User
-from django.test import TransactionTestCase
+from django.test import LiveServerTestCase
 from django.test.utils import override_settings
 from django.core.management import execute_from_command_line
-import threading
-import subprocess
 import os
-import signal
+import unittest
 
 
-class StripeE2ETest(TransactionTestCase):
-    """End-to-end test for Stripe payment flow using Playwright."""
+@unittest.skipUnless(os.environ.get('RUN_LIVE_STRIPE') == '1', 'set RUN_LIVE_STRIPE=1')
+class StripeE2ETest(LiveServerTestCase):
+    """End-to-end test for Stripe payment flow using Playwright.
+    
+    LiveServerTestCase serves the app in-process on an ephemeral port,
+    exposed as ``self.live_server_url``.
+    """
     
     @classmethod
     def setUpClass(cls):
@@ -31,127 +34,131 @@ class StripeE2ETest(TransactionTestCase):
             email='test@example.com'
         )
         
-        # Start Django development server in background
-        cls.server_process = None
-        cls.start_test_server()
+        # Launch Chromium once per class on a dedicated event loop;
+        # each test only opens a cheap BrowserContext on it
+        cls._loop = asyncio.new_event_loop()
+        cls._playwright = cls._loop.run_until_complete(async_playwright().start())
+        cls._browser = cls._loop.run_until_complete(
+            cls._playwright.chromium.launch(headless=True)
+        )
     
     @classmethod
     def tearDownClass(cls):
-        if cls.server_process:
-            cls.server_process.terminate()
-            cls.server_process.wait()
+        cls._loop.run_until_complete(cls._browser.close())
+        cls._loop.run_until_complete(cls._playwright.stop())
+        cls._loop.close()
         super().tearDownClass()
     
-    @classmethod
-    def start_test_server(cls):
-        """Start Django development server for testing."""
+    async def test_stripe_payment_flow(self):
+        """Test complete Stripe payment flow from cart to completion."""
+        # Fresh context per test; the browser itself is shared by the class
+        context = await self._browser.new_context()
+        page = await context.new_page()
+        
         try:
-            # Kill any existing server on port 8000
-            subprocess.run(['pkill', '-f', 'runserver'], capture_output=True)
-            time.sleep(2)
+            # Navigate to POS login page
+            await page.goto(f"{self.live_server_url}/admin/login/")
+            await page.locator('input[name="username"]').wait_for()
             
-            # Start new server
-            cls.server_process = subprocess.Popen([
-                'python', 'manage.py', 'runserver', '127.0.0.1:8000'
-            ], cwd='/workspaces/ireti-pos-light', stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            # Login
+            await page.fill('input[name="username"]', 'testuser')
+            await page.fill('input[name="password"]', 'testpass123')
+            await page.click('input[type="submit"]')
             
-            # Wait for server to start
-            time.sleep(5)
-        except Exception as e:
-            print(f"Error starting test server: {e}")
-    
-    async def test_stripe_payment_flow(self):
-        """Test complete Stripe payment flow from cart to completion."""
-        async with async_playwright() as p:
-            # Launch browser
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+            # Wait for redirect and navigate to POS main page
+            await page.wait_for_load_state()
+            await page.goto(f"{self.live_server_url}/")
+            
+            # Add items to cart (simulate scanning/adding products)
+            # This would depend on your POS interface - adjust selectors as needed
+            cart_data = [
+                {'barcode': 'TEST001', 'name': 'Test Product', 'price': '10.99', 'quantity': 2}
+            ]
+            
+            # Inject cart data into session storage
+            await page.evaluate(f"""
+                sessionStorage.setItem('cart', JSON.stringify({json.dumps(cart_data)}));
+            """)
             
+            # Navigate to transaction page
+            await page.goto(f"{self.live_server_url}/transaction/")
+            
+            # Select Stripe payment method
+            stripe_button = page.locator('button:has-text("Stripe")')
+            if await stripe_button.count() > 0:
+                await stripe_button.click()
+            else:
+                # Try alternative selector
+                await page.click('input[value="STRIPE"]')
+            
+            # Wait for Stripe payment form to load
+            stripe_iframe = page.locator('iframe[name^="__privateStripeFrame"]')
+            try:
+                await stripe_iframe.first.wait_for(state='attached', timeout=15000)
+            except PlaywrightTimeoutError:
+                pass
+            
+            # Fill Stripe test card details
+            # Note: In a real test, you'd use Stripe's test card numbers
+            if await stripe_iframe.count() > 0:
+                iframe_handle = await stripe_iframe.first.element_handle()
+                stripe_frame = await iframe_handle.content_frame()
+                await stripe_frame.locator('input[name="cardnumber"]').wait_for()
+                # Stripe Elements inputs are framework-controlled, so type through
+                # fill(); assigning .value in the page would not reach Stripe's state
+                for name, value in (
+                    ('cardnumber', '4242424242424242'),
+                    ('exp-date', '12/34'),
+                    ('cvc', '123'),
+                    ('postal', '12345'),
+                ):
+                    field = stripe_frame.locator(f'input[name="{name}"]')
+                    if await field.count() > 0:
+                        await field.fill(value)
+            
+            # Submit payment
+            submit_button = page.locator('button:has-text("Complete Payment")')
+            if await submit_button.count() > 0:
+                await submit_button.click()
+            
+            # Wait for payment processing to report success or failure
             try:
-                # Navigate to POS login page
-                await page.goto('http://127.0.0.1:8000/admin/login/')
-                
-                # Login
-                await page.fill('input[name="username"]', 'testuser')
-                await page.fill('input[name="password"]', 'testpass123')
-                await page.click('input[type="submit"]')
-                
-                # Wait for redirect and navigate to POS main page
-                await page.wait_for_timeout(2000)
-                await page.goto('http://127.0.0.1:8000/')
-                
-                # Add items to cart (simulate scanning/adding products)
-                # This would depend on your POS interface - adjust selectors as needed
-                cart_data = [
-                    {'barcode': 'TEST001', 'name': 'Test Product', 'price': '10.99', 'quantity': 2}
-                ]
-                
-                # Inject cart data into session storage
-                await page.evaluate(f"""
-                    sessionStorage.setItem('cart', JSON.stringify({json.dumps(cart_data)}));
-                """)
-                
-                # Navigate to transaction page
-                await page.goto('http://127.0.0.1:8000/transaction/')
-                
-                # Select Stripe payment method
-                stripe_button = page.locator('button:has-text("Stripe")')
-                if await stripe_button.count() > 0:
-                    await stripe_button.click()
-                else:
-                    # Try alternative selector
-                    await page.click('input[value="STRIPE"]')
-                
-                # Wait for Stripe payment form to load
-                await page.wait_for_timeout(3000)
-                
-                # Fill Stripe test card details
-                # Note: In a real test, you'd use Stripe's test card numbers
-                stripe_frame = page.frame_locator('iframe[name^="__privateStripeFrame"]')
-                if await stripe_frame.count() > 0:
-                    await stripe_frame.locator('input[name="cardnumber"]').fill('4242424242424242')
-                    await stripe_frame.locator('input[name="exp-date"]').fill('12/34')
-                    await stripe_frame.locator('input[name="cvc"]').fill('123')
-                    await stripe_frame.locator('input[name="postal"]').fill('12345')
-                
-                # Submit payment
-                submit_button = page.locator('button:has-text("Complete Payment")')
-                if await submit_button.count() > 0:
-                    await submit_button.click()
-                
-                # Wait for payment processing
-                await page.wait_for_timeout(5000)
-                
-                # Check for success or error messages
-                success_indicator = page.locator('.payment-success, .alert-success')
-                error_indicator = page.locator('.payment-error, .alert-danger')
-                
-                if await success_indicator.count() > 0:
-                    print("✅ Stripe payment flow completed successfully")
-                    success = True
-                elif await error_indicator.count() > 0:
-                    error_text = await error_indicator.text_content()
-                    print(f"❌ Payment failed with error: {error_text}")
-                    success = False
-                else:
-                    print("⚠️ Payment status unclear - check manually")
-                    success = None
-                
-                # Take screenshot for debugging
-                await page.screenshot(path='/workspaces/ireti-pos-light/test_screenshots/stripe_e2e_result.png')
-                
-                return success
-                
-            except Exception as e:
-                print(f"Error during Stripe E2E test: {e}")
-                await page.screenshot(path='/workspaces/ireti-pos-light/test_screenshots/stripe_e2e_error.png')
-                return False
-            finally:
-                await browser.close()
+                await page.locator(
+                    '.payment-success, .payment-error, .alert-success, .alert-danger'
+                ).first.wait_for(timeout=15000)
+            except PlaywrightTimeoutError:
+                pass
+            
+            # Check for success or error messages
+            success_indicator = page.locator('.payment-success, .alert-success')
+            error_indicator = page.locator('.payment-error, .alert-danger')
+            
+            if await success_indicator.count() > 0:
+                print("✅ Stripe payment flow completed successfully")
+                success = True
+            elif await error_indicator.count() > 0:
+                error_text = await error_indicator.text_content()
+                print(f"❌ Payment failed with error: {error_text}")
+                success = False
+            else:
+                print("⚠️ Payment status unclear - check manually")
+                success = None
+            
+            # Take screenshot for debugging
+            await page.screenshot(path='/workspaces/ireti-pos-light/test_screenshots/stripe_e2e_result.png')
+            
+            return success
+            
+        except Exception as e:
+            print(f"Error during Stripe E2E test: {e}")
+            await page.screenshot(path='/workspaces/ireti-pos-light/test_screenshots/stripe_e2e_error.png')
+            return False
+        finally:
+            await context.close()
     
     def test_run_stripe_e2e(self):
         """Django test wrapper for async Stripe E2E test."""
-        result = asyncio.run(self.test_stripe_payment_flow())
+        result = self._loop.run_until_complete(self.test_stripe_payment_flow())
         
         # Assert based on result
         if result is True:
@@ -5,11 +5,12 @@ Simple API test (moved to tests/unit)
 
 import os
 import sys
-import django
 
-# Setup Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iretilightpos.settings')
-django.setup()
+if __name__ == '__main__':
+    # Run directly rather than under pytest: configure Django as tests/conftest.py does
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from tests._django_setup import setup_django
+    setup_django()
 
 from django.test import Client
 import json
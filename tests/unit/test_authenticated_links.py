@@ -4,26 +4,31 @@ Test authenticated access to broken links URLs (moved under tests/unit).
 """
 
 import os
-import django
-from django.test import Client
-from django.contrib.auth.models import User
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-# Setup Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iretilightpos.settings.devlopement')
-django.setup()
+if __name__ == '__main__':
+    # Run directly rather than under pytest: configure Django as tests/conftest.py does
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from tests._django_setup import setup_django
+    setup_django()
 
-def test_authenticated_access():
-    client = Client()
+from django.test import Client
+from django.contrib.auth.models import User
+from django.db import connection
+
+@lru_cache(maxsize=None)
+def get_test_user():
+    """Fetch or create the shared test superuser once per process."""
     try:
-        user = User.objects.get(username='testuser')
+        return User.objects.get(username='testuser')
     except User.DoesNotExist:
-        user = User.objects.create_superuser('testuser', 'test@example.com', 'testpass123')
+        return User.objects.create_superuser('testuser', 'test@example.com', 'testpass123')
 
-    login_success = client.login(username='testuser', password='testpass123')
-    if not login_success:
-        print("❌ Failed to login test user")
-        return
+def test_authenticated_access():
+    user = get_test_user()
 
     urls_to_test = [
         '/dashboard_sales/',
@@ -37,9 +42,42 @@ def test_authenticated_access():
         '/retail_display/',
     ]
 
-    for url in urls_to_test:
-        response = client.get(url)
-        print(f"{url} -> {response.status_code}")
+    # Each worker thread gets its own logged-in client so sessions don't clobber each other
+    thread_state = threading.local()
+
+    def fetch(url):
+        thread_client = getattr(thread_state, 'client', None)
+        if thread_client is None:
+            thread_client = thread_state.client = Client()
+            thread_client.force_login(user)
+        try:
+            return url, thread_client.get(url), None
+        except Exception as e:
+            return url, None, e
+        finally:
+            # Worker threads open their own DB connection; don't leak it past the pool
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(fetch, urls_to_test))
+
+    for url, response, error in results:
+        if error is not None:
+            print(f"❌ {url}: Exception - {str(error)}")
+            continue
+
+        status = response.status_code
+        if status == 200:
+            print(f"✅ {url}: {status} (OK)")
+        elif status == 302:
+            redirect_url = response.get('Location', 'Unknown')
+            print(f"⚠️  {url}: {status} (Redirect to {redirect_url})")
+        elif status == 404:
+            print(f"❌ {url}: {status} (Not Found)")
+        elif status == 500:
+            print(f"❌ {url}: {status} (Server Error)")
+        else:
+            print(f"⚠️  {url}: {status}")
 
 if __name__ == '__main__':
     test_authenticated_access()
@@ -5,17 +5,20 @@ Moved into tests/unit for discoverability.
 """
 import os
 import sys
-import django
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-# Setup Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iretilightpos.settings.devlopement')
-django.setup()
+if __name__ == '__main__':
+    # Run directly rather than under pytest: configure Django as tests/conftest.py does
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from tests._django_setup import setup_django
+    setup_django()
 
 from django.test import Client
 from django.contrib.auth import get_user_model
+from django.db import connection
 
 def test_broken_links():
-    client = Client()
     test_cases = [
         ('/dashboard_sales/', 'BL-001', 'Sales Dashboard'),
         ('/dashboard_department/', 'BL-002', 'Department Dashboard'),
@@ -27,10 +30,95 @@ def test_broken_links():
         ('/retail_display/', 'BL-009', 'Customer Display')
     ]
 
-    # Unauthenticated checks
-    for url, story_id, desc in test_cases:
-        response = client.get(url, follow=False)
-        print(f"{story_id} {url} -> {response.status_code}")
+    # Unauthenticated checks go through the full client so auth redirects and
+    # CSRF middleware are exercised, one client per worker thread
+    anonymous_state = threading.local()
+
+    def fetch_anonymous(case):
+        thread_client = getattr(anonymous_state, 'client', None)
+        if thread_client is None:
+            thread_client = anonymous_state.client = Client()
+        try:
+            return case, thread_client.get(case[0], follow=False), None
+        except Exception as e:
+            return case, None, e
+        finally:
+            # Worker threads open their own DB connection; don't leak it past the pool
+            connection.close()
+
+    print("=== TESTING UNAUTHENTICATED ACCESS ===")
+    print("Expected: All should return 302 (redirect to login)\n")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(fetch_anonymous, test_cases))
+
+    all_unauthenticated_pass = True
+    for (url, story_id, desc), response, error in results:
+        if error is not None:
+            print(f"❌ {story_id}: {url} → ERROR: {error}")
+            all_unauthenticated_pass = False
+        elif response.status_code == 302:
+            location = response.get('Location', '')
+            if '/user/login/' in location:
+                print(f"✅ {story_id}: {url} → 302 (redirects to login)")
+            else:
+                print(f"❌ {story_id}: {url} → 302 but wrong redirect: {location}")
+                all_unauthenticated_pass = False
+        else:
+            print(f"❌ {story_id}: {url} → {response.status_code} (expected 302)")
+            all_unauthenticated_pass = False
+
+    print(f"\n=== TESTING AUTHENTICATED ACCESS ===")
+    print("Expected: All should return 200 (or 302 for admin portal)\n")
+
+    User = get_user_model()
+    try:
+        admin_user = User.objects.get(username='admin')
+        print("✅ Logged in as admin user\n")
+    except User.DoesNotExist:
+        print("❌ Admin user not found - cannot test authenticated access")
+        return False
+
+    # Authenticated pages render templates, so go through the full client,
+    # one logged-in client per worker thread
+    admin_state = threading.local()
+
+    def fetch_authenticated(case):
+        thread_client = getattr(admin_state, 'client', None)
+        if thread_client is None:
+            thread_client = admin_state.client = Client()
+            thread_client.force_login(admin_user)
+        try:
+            return case, thread_client.get(case[0], follow=False).status_code, None
+        except Exception as e:
+            return case, None, e
+        finally:
+            # Worker threads open their own DB connection; don't leak it past the pool
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(fetch_authenticated, test_cases))
+
+    all_authenticated_pass = True
+    for (url, story_id, desc), status, error in results:
+        if error is not None:
+            print(f"❌ {story_id}: {url} → ERROR: {error}")
+            all_authenticated_pass = False
+        elif story_id == 'BL-007' and status in [302, 200]:
+            print(f"✅ {story_id}: {url} → {status} (admin portal)")
+        elif status == 200:
+            print(f"✅ {story_id}: {url} → 200 ({desc})")
+        else:
+            print(f"❌ {story_id}: {url} → {status} (expected 200)")
+            all_authenticated_pass = False
+
+    print(f"\n=== SUMMARY ===")
+    if all_unauthenticated_pass and all_authenticated_pass:
+        print("✅ All broken links are working correctly!")
+        return True
+    else:
+        print("❌ Some links need fixing before marking as completed")
+        return False
 
 if __name__ == "__main__":
     test_broken_links()
@@ -7,12 +7,12 @@ import os
 import sys
 import json
 from decimal import Decimal
-import django
 
-# Set up Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iretilightpos.settings')
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-django.setup()
+if __name__ == '__main__':
+    # Run directly rather than under pytest: configure Django as tests/conftest.py does
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from tests._django_setup import setup_django
+    setup_django()
 
 from django.test import Client
 
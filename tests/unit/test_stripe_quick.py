@@ -4,14 +4,6 @@ Quick Stripe integration tests (moved into tests/unit)
 """
 import os
 import sys
-import django
-
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iretilightpos.settings.devlopement')
-os.environ['DJANGO_TESTING'] = '1'
-try:
-    django.setup()
-except Exception:
-    pass
 
 def main():
     print("🔍 Quick stripe checks placeholder")
@@ -4,13 +4,6 @@ Stripe payment service tests (moved to tests/unit).
 """
 import os
 import sys
-import django
-
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iretilightpos.settings.devlopement')
-try:
-    django.setup()
-except Exception:
-    pass
 
 def main():
     print("🔧 Stripe service tests placeholder")
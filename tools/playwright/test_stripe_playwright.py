@@ -4,27 +4,36 @@ This tests the complete payment flow from the browser perspective.
 """
 
 import json
-from django.test import TestCase, Client
+from django.conf import settings
+from django.test import TestCase, Client, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
 
 
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    # Keep the session in a signed cookie so tests never write session rows
+    SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies',
+)
 class StripePlaywrightTest(TestCase):
     """Test Stripe integration using Playwright MCP for browser automation."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Create the test user once for the whole class."""
+        cls.user = User.objects.create_user(
             username='testuser',
-            password='testpass123',
             email='test@example.com'
         )
+    
+    def setUp(self):
+        """Set up test data."""
         self.client = Client()
     
     def test_stripe_payment_page_loads(self):
         """Test that Stripe payment page loads correctly."""
-        # Login first
-        self.client.login(username='testuser', password='testpass123')
+        # Login first (skips the auth backend and password check)
+        self.client.force_login(self.user)
         
         # Set up cart session data
         session = self.client.session
@@ -40,6 +49,8 @@ class StripePlaywrightTest(TestCase):
             }
         ]
         session.save()
+        # Signed-cookie sessions change key on save, so hand the new cookie to the client
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
         
         # Test the Stripe payment initiation endpoint
         response = self.client.post(reverse('start_stripe_payment'), {
@@ -8,19 +8,211 @@ for secure payment card data handling.
 
 import os
 import sys
-import django
+import hashlib
 import json
+import mmap
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 
-# Setup Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iretilightpos.settings.base')
-sys.path.insert(0, str(Path(__file__).parent.parent))
-django.setup()
-
+# django.conf.settings is a lazy proxy; Django itself is only set up when the
+# script runs, so importing this module (e.g. in scan worker processes) stays cheap
 from django.conf import settings
-from django.apps import apps
-from payments.models import PaymentTransaction, PaymentRefund, PaymentMethod
+
+# Patterns are compiled once at import instead of on every file scanned.
+# All card brands share one alternation so each file is scanned in a single pass.
+_CARD_PATTERN = re.compile(
+    rb'\b(?:'
+    rb'4[0-9]{12}(?:[0-9]{3})?'    # Visa
+    rb'|5[1-5][0-9]{14}'           # Mastercard
+    rb'|3[47][0-9]{13}'            # American Express
+    rb'|3[0-9]{13}'                # Diners Club
+    rb'|6(?:011|5[0-9]{2})[0-9]{12}'  # Discover
+    rb')\b'
+)
+
+_DANGEROUS_SECRET_SOURCES = {
+    'sk_live': r'sk_live_[a-zA-Z0-9]{99}',  # Actual live secret keys
+    'sk_test': r'sk_test_[a-zA-Z0-9]{99}',  # Actual test secret keys (full length)
+    'whsec': r'whsec_[a-zA-Z0-9]{32,64}'    # Actual webhook secrets
+}
+# One named-group alternation; match.lastgroup tells which secret type hit.
+# Compiled as a bytes pattern since the scan reads raw file bytes.
+_DANGEROUS_SECRET_PATTERN = re.compile(
+    '|'.join(f'(?P<{name}>{source})' for name, source in _DANGEROUS_SECRET_SOURCES.items()).encode()
+)
+
+# Field-name fragments that suggest stored cardholder data, matched as one
+# alternation so each field name is scanned once rather than once per fragment
+_SENSITIVE_FIELD_PATTERNS = [
+    'card_number', 'cardnumber', 'card-number',
+    'cvv', 'cvc', 'cvc2', 'cvv2',
+    'expiry', 'exp_month', 'exp_year', 'expiration',
+    'pan', 'primary_account_number',
+    'track', 'magnetic_stripe',
+    'pin', 'pin_number'
+]
+_SENSITIVE_FIELD_PATTERN = re.compile('|'.join(map(re.escape, _SENSITIVE_FIELD_PATTERNS)))
+
+# Cheap prefilters: a card number needs a 13+ digit run and every secret
+# pattern starts with one of these literals, so most files skip the regexes
+_DIGIT_RUN = re.compile(rb'\d{13,}')
+_DIGITS = b'0123456789'
+_MAX_CARD_HITS = 5
+_SECRET_LITERALS = (b'sk_', b'whsec_')
+
+# Repository scan settings; each check keeps its own directory exclusions
+_CARD_SCAN_SKIP_DIRS = frozenset({'.git', '__pycache__', 'logs', '.pytest_cache'})
+_CARD_SCAN_EXTENSIONS = ('.py',)
+# The secret scan also skips every hidden directory
+_SECRET_SCAN_SKIP_DIRS = frozenset({'node_modules', '__pycache__'})
+_SECRET_SCAN_EXTENSIONS = ('.py', '.js', '.json', '.env')
+# Larger files are bundles or lockfiles, not hand-written source; they are
+# not read, and each one is reported as a warning
+_MAX_SCAN_BYTES = 2_000_000
+_SECRET_EXCLUDE_PATTERNS = [
+    'test_',  # Exclude test files
+    'example',  # Exclude example files
+    'startswith',  # Exclude validation code
+    'placeholder',  # Exclude placeholder values
+    'your_secret_key_here',  # Exclude templates
+    'bandit_scan_results.json'  # Exclude scan results
+]
+# Compiled once so each file name / file body is checked in a single search
+_EXCLUDE_SUBSTR = re.compile('|'.join(map(re.escape, _SECRET_EXCLUDE_PATTERNS)))
+_EXCLUDE_SUBSTR_BYTES = re.compile(_EXCLUDE_SUBSTR.pattern.encode())
+# Per-file scan results are cached here between runs, keyed by mtime and size
+_SCAN_CACHE_DIR = Path.home() / '.cache' / 'pci_check'
+
+
+def _match_card_patterns(file_path, content):
+    """Return report entries for card-number patterns found in content."""
+    # Deleting digits in C is cheaper than a regex; fewer than 13 digits
+    # in the whole file means no card number can be present
+    if len(content) - len(content.translate(None, _DIGITS)) < 13:
+        return []
+    if not _DIGIT_RUN.search(content):
+        return []
+    # Only a few sample matches are needed for the report
+    hits = [m.group(0).decode('ascii')
+            for m in islice(_CARD_PATTERN.finditer(content), _MAX_CARD_HITS + 1)]
+    if not hits:
+        return []
+    if len(hits) > _MAX_CARD_HITS:
+        return [f"{file_path}: {hits[:_MAX_CARD_HITS]} (truncated)"]
+    return [f"{file_path}: {hits}"]
+
+
+def _match_secret_patterns(file_path, content):
+    """Return report entries for hardcoded secrets found in content."""
+    # Skip files that contain validation or test code
+    if _EXCLUDE_SUBSTR_BYTES.search(content):
+        return []
+    if not any(literal in content for literal in _SECRET_LITERALS):
+        return []
+    matched = {m.lastgroup for m in _DANGEROUS_SECRET_PATTERN.finditer(content)}
+    return [f"{file_path}: matches {source}"
+            for name, source in _DANGEROUS_SECRET_SOURCES.items() if name in matched]
+
+
+@lru_cache(maxsize=1)
+def _all_model_fields():
+    """
+    Return (model name, field name, lowercased field name) for every model field.
+    Model introspection is idempotent, so it is done once per process.
+    """
+    from django.apps import apps
+    
+    return tuple((model.__name__, field.name, field.name.lower())
+                 for model in apps.get_models()
+                 for field in model._meta.get_fields())
+
+
+def _iter_source_files(root):
+    """
+    Walk root once for both scans and yield (path, scan_card, scan_secret, size,
+    mtime_ns) for every file either scan covers. A directory is only pruned when both
+    scans exclude it; otherwise the flags record which scans still apply.
+    """
+    stack = [(root, True, True)]
+    while stack:
+        dir_path, card_ok, secret_ok = stack.pop()
+        try:
+            it = os.scandir(dir_path)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    card_dir = card_ok and name not in _CARD_SCAN_SKIP_DIRS
+                    secret_dir = (secret_ok and not name.startswith('.')
+                                  and name not in _SECRET_SCAN_SKIP_DIRS)
+                    if card_dir or secret_dir:
+                        stack.append((entry.path, card_dir, secret_dir))
+                    continue
+                scan_card = card_ok and name.endswith(_CARD_SCAN_EXTENSIONS)
+                scan_secret = (secret_ok and name.endswith(_SECRET_SCAN_EXTENSIONS)
+                               and not _EXCLUDE_SUBSTR.search(name))
+                if not (scan_card or scan_secret):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                yield entry.path, scan_card, scan_secret, st.st_size, st.st_mtime_ns
+
+
+def _scan_one_file(file_path, scan_card, scan_secret):
+    """Read one file and return (file_path, card_hits, secret_hits)."""
+    try:
+        with open(file_path, 'rb') as f:
+            content = f.read()
+    except OSError:
+        return file_path, [], []
+    
+    card_hits = _match_card_patterns(file_path, content) if scan_card else []
+    secret_hits = _match_secret_patterns(file_path, content) if scan_secret else []
+    return file_path, card_hits, secret_hits
+
+
+def _scan_cache_path():
+    """
+    Return the scan cache file for this working directory and pattern set.
+    Changing any pattern yields a new file, so stale results are never reused.
+    """
+    key = hashlib.sha256(b'\0'.join((
+        os.getcwd().encode(),
+        _CARD_PATTERN.pattern,
+        _DANGEROUS_SECRET_PATTERN.pattern,
+        _EXCLUDE_SUBSTR_BYTES.pattern,
+        str(_MAX_CARD_HITS).encode(),
+        repr((sorted(_CARD_SCAN_SKIP_DIRS), sorted(_SECRET_SCAN_SKIP_DIRS))).encode(),
+    ))).hexdigest()
+    return _SCAN_CACHE_DIR / f'scan-{key[:16]}.json'
+
+
+def _load_scan_cache(cache_path):
+    """Load cached per-file results, treating a missing or corrupt cache as empty."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_scan_cache(cache_path, cache):
+    """Write the cache atomically; failures only cost a rescan next run."""
+    tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
 
 
 class PCIComplianceChecker:
@@ -31,6 +223,12 @@ class PCIComplianceChecker:
     def __init__(self):
         self.compliance_issues = []
         self.compliance_passed = []
+        self.compliance_warnings = []
+        self._scan_results = None
+        # Resolve settings once rather than through the lazy proxy in every check
+        self._logging_cfg = getattr(settings, 'LOGGING', {})
+        self._db_default = settings.DATABASES.get('default', {})
+        self._webhook_secret = getattr(settings, 'STRIPE_WEBHOOK_ENDPOINT_SECRET', None)
         
     def log_pass(self, check_name: str, details: str = ""):
         """Log a passed compliance check."""
@@ -54,6 +252,7 @@ class PCIComplianceChecker:
         if details:
             message += f": {details}"
         print(message)
+        self.compliance_warnings.append({"check": check_name, "details": details})
     
     def check_cardholder_data_storage(self):
         """
@@ -63,27 +262,16 @@ class PCIComplianceChecker:
         print("\n🔍 Checking for prohibited cardholder data storage...")
         
         # Check database models for sensitive fields
-        sensitive_field_patterns = [
-            'card_number', 'cardnumber', 'card-number',
-            'cvv', 'cvc', 'cvc2', 'cvv2',
-            'expiry', 'exp_month', 'exp_year', 'expiration',
-            'pan', 'primary_account_number',
-            'track', 'magnetic_stripe',
-            'pin', 'pin_number'
-        ]
-        
         found_sensitive_fields = []
         
-        for model in apps.get_models():
-            for field in model._meta.get_fields():
-                field_name = field.name.lower()
-                if any(pattern in field_name for pattern in sensitive_field_patterns):
-                    # Check if it's in our allowed models (like metadata fields)
-                    if (model.__name__ in ['PaymentTransaction', 'PaymentRefund'] and 
-                        field_name in ['metadata']):
-                        # This is allowed - metadata is for non-sensitive data only
-                        continue
-                    found_sensitive_fields.append(f"{model.__name__}.{field.name}")
+        for model_name, raw_field_name, field_name in _all_model_fields():
+            if _SENSITIVE_FIELD_PATTERN.search(field_name):
+                # Check if it's in our allowed models (like metadata fields)
+                if (model_name in ['PaymentTransaction', 'PaymentRefund'] and 
+                    field_name in ['metadata']):
+                    # This is allowed - metadata is for non-sensitive data only
+                    continue
+                found_sensitive_fields.append(f"{model_name}.{raw_field_name}")
         
         if found_sensitive_fields:
             self.log_fail("No cardholder data storage", 
@@ -95,35 +283,63 @@ class PCIComplianceChecker:
         # Check for hardcoded card data in code
         self.check_code_for_card_data()
     
+    def _scan_repo(self):
+        """
+        Walk the repository once, reading each source file a single time
+        and applying both the card-data and hardcoded-secret patterns.
+        """
+        if self._scan_results is not None:
+            return self._scan_results
+        
+        # Files whose mtime and size match the previous run reuse its results
+        cache_path = _scan_cache_path()
+        cache = _load_scan_cache(cache_path)
+        fresh_cache = {}
+        ordered_paths = []
+        stats = {}
+        
+        paths = []
+        card_flags = []
+        secret_flags = []
+        
+        # The walker's DirEntry.stat() result keys the cache; no second stat per file
+        for file_path, scan_card, scan_secret, size, mtime_ns in _iter_source_files('.'):
+            if size > _MAX_SCAN_BYTES:
+                self.log_warning("File not scanned",
+                                 f"{file_path} ({size} bytes exceeds the {_MAX_SCAN_BYTES} byte scan limit)")
+                continue
+            
+            ordered_paths.append(file_path)
+            cached = cache.get(file_path)
+            if cached and cached[0] == mtime_ns and cached[1] == size:
+                fresh_cache[file_path] = cached
+            else:
+                stats[file_path] = (mtime_ns, size)
+                paths.append(file_path)
+                card_flags.append(scan_card)
+                secret_flags.append(scan_secret)
+        
+        # Regex matching is CPU-bound, so shard the changed files across processes
+        if paths:
+            with ProcessPoolExecutor() as executor:
+                for file_path, file_card_hits, file_secret_hits in executor.map(
+                        _scan_one_file, paths, card_flags, secret_flags, chunksize=64):
+                    fresh_cache[file_path] = [*stats[file_path], file_card_hits, file_secret_hits]
+        
+        _save_scan_cache(cache_path, fresh_cache)
+        
+        card_hits = []
+        secret_hits = []
+        for file_path in ordered_paths:
+            card_hits.extend(fresh_cache[file_path][2])
+            secret_hits.extend(fresh_cache[file_path][3])
+        
+        self._scan_results = (card_hits, secret_hits)
+        return self._scan_results
+    
     def check_code_for_card_data(self):
         """Check source code for hardcoded card data patterns."""
-        card_patterns = [
-            r'\b4[0-9]{12}(?:[0-9]{3})?\b',  # Visa
-            r'\b5[1-5][0-9]{14}\b',         # Mastercard
-            r'\b3[47][0-9]{13}\b',          # American Express
-            r'\b3[0-9]{13}\b',              # Diners Club
-            r'\b6(?:011|5[0-9]{2})[0-9]{12}\b'  # Discover
-        ]
-        
-        found_patterns = []
-        
-        # Search Python files
-        for root, dirs, files in os.walk('.'):
-            # Skip certain directories
-            dirs[:] = [d for d in dirs if d not in ['.git', '__pycache__', 'logs', '.pytest_cache']]
-            
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            for pattern in card_patterns:
-                                matches = re.findall(pattern, content)
-                                if matches:
-                                    found_patterns.append(f"{file_path}: {matches}")
-                    except (UnicodeDecodeError, IOError):
-                        continue
+        found_patterns, _ = self._scan_repo()
         
         if found_patterns:
             self.log_fail("No hardcoded card data", 
@@ -142,19 +358,24 @@ class PCIComplianceChecker:
         prod_settings_path = './iretilightpos/settings/production.py'
         if os.path.exists(prod_settings_path):
             try:
-                with open(prod_settings_path, 'r') as f:
-                    content = f.read()
-                    
                 https_settings = {
-                    'SESSION_COOKIE_SECURE': 'SESSION_COOKIE_SECURE = True',
-                    'CSRF_COOKIE_SECURE': 'CSRF_COOKIE_SECURE = True', 
-                    'SECURE_SSL_REDIRECT': 'SECURE_SSL_REDIRECT = True'
+                    'SESSION_COOKIE_SECURE': b'SESSION_COOKIE_SECURE = True',
+                    'CSRF_COOKIE_SECURE': b'CSRF_COOKIE_SECURE = True', 
+                    'SECURE_SSL_REDIRECT': b'SECURE_SSL_REDIRECT = True'
                 }
                 
-                missing_settings = []
-                for setting_name, setting_line in https_settings.items():
-                    if setting_line not in content:
-                        missing_settings.append(setting_name)
+                # Search the mapped file directly instead of reading it into a string;
+                # an empty file cannot be mapped and simply has none of the settings
+                with open(prod_settings_path, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        missing_settings = list(https_settings)
+                        hsts_configured = False
+                    else:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            missing_settings = [setting_name
+                                                for setting_name, setting_line in https_settings.items()
+                                                if mm.find(setting_line) == -1]
+                            hsts_configured = mm.find(b'SECURE_HSTS_SECONDS = 31536000') != -1
                 
                 if missing_settings:
                     self.log_fail("HTTPS enforcement", 
@@ -163,7 +384,7 @@ class PCIComplianceChecker:
                     self.log_pass("HTTPS enforcement", "All HTTPS security settings enabled in production")
                     
                 # Check HSTS settings in production file
-                if 'SECURE_HSTS_SECONDS = 31536000' in content:
+                if hsts_configured:
                     self.log_pass("HSTS configuration", "HSTS properly configured for 1 year in production")
                 else:
                     self.log_warning("HSTS configuration", "HSTS duration may not be optimal in production")
@@ -204,8 +425,7 @@ class PCIComplianceChecker:
         """
         print("\n🔗 Checking webhook security...")
         
-        webhook_secret = getattr(settings, 'STRIPE_WEBHOOK_ENDPOINT_SECRET', None)
-        if not webhook_secret:
+        if not self._webhook_secret:
             self.log_warning("Webhook secret configuration", 
                            "STRIPE_WEBHOOK_ENDPOINT_SECRET not configured in settings")
         else:
@@ -244,12 +464,12 @@ class PCIComplianceChecker:
         # Check Django permissions (skip if no database configured)
         try:
             from django.contrib.auth.models import Permission
-            payment_permissions = Permission.objects.filter(
+            has_payment_permissions = Permission.objects.filter(
                 content_type__app_label='payments'
-            ).count()
+            ).exists()
             
-            if payment_permissions > 0:
-                self.log_pass("Django permissions", f"Found {payment_permissions} payment-related permissions")
+            if has_payment_permissions:
+                self.log_pass("Django permissions", "Payment-related permissions are defined")
             else:
                 self.log_warning("Django permissions", "No payment-specific permissions found")
         except Exception as e:
@@ -270,14 +490,14 @@ class PCIComplianceChecker:
             self.log_fail("Secure logging utilities", "Secure logging utilities not found")
         
         # Check logging configuration
-        logging_config = getattr(settings, 'LOGGING', {})
-        if 'payments' in logging_config.get('loggers', {}):
+        loggers = self._logging_cfg.get('loggers', {})
+        if 'payments' in loggers:
             self.log_pass("Payment logging configuration", "Payment-specific logging configured")
         else:
             self.log_warning("Payment logging configuration", "No payment-specific logging configuration")
         
         # Check if audit logging exists
-        if 'payments.audit' in logging_config.get('loggers', {}):
+        if 'payments.audit' in loggers:
             self.log_pass("Audit logging", "Audit logging configured")
         else:
             self.log_warning("Audit logging", "No specific audit logging configuration")
@@ -310,42 +530,7 @@ class PCIComplianceChecker:
             self.log_warning("Stripe publishable key", "Stripe publishable key not found")
         
         # Check for actual hardcoded secrets (excluding validation code and test placeholders)
-        dangerous_patterns = [
-            r'sk_live_[a-zA-Z0-9]{99}',  # Actual live secret keys
-            r'sk_test_[a-zA-Z0-9]{99}',  # Actual test secret keys (full length)
-            r'whsec_[a-zA-Z0-9]{32,64}' # Actual webhook secrets
-        ]
-        
-        hardcoded_found = []
-        exclude_patterns = [
-            'test_',  # Exclude test files
-            'example',  # Exclude example files
-            'startswith',  # Exclude validation code
-            'placeholder',  # Exclude placeholder values
-            'your_secret_key_here',  # Exclude templates
-            'bandit_scan_results.json'  # Exclude scan results
-        ]
-        
-        for root, dirs, files in os.walk('.'):  
-            # Skip hidden directories and common exclusions
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__']]
-            
-            for file in files:
-                if file.endswith(('.py', '.js', '.json', '.env')) and not any(excl in file for excl in exclude_patterns):
-                    filepath = os.path.join(root, file)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            
-                            # Skip files that contain validation or test code
-                            if any(excl in content for excl in exclude_patterns):
-                                continue
-                                
-                            for pattern in dangerous_patterns:
-                                if re.search(pattern, content):
-                                    hardcoded_found.append(f"{filepath}: matches {pattern}")
-                    except (UnicodeDecodeError, PermissionError):
-                        continue
+        _, hardcoded_found = self._scan_repo()
         
         if hardcoded_found:
             self.log_fail("Hardcoded secrets", f"Found hardcoded secrets: {hardcoded_found}")
@@ -356,7 +541,7 @@ class PCIComplianceChecker:
         """Check database configuration for security."""
         print("\n🗄️ Checking database security...")
         
-        db_config = settings.DATABASES.get('default', {})
+        db_config = self._db_default
         db_engine = db_config.get('ENGINE', '')
         
         if 'sqlite' in db_engine:
@@ -380,27 +565,30 @@ class PCIComplianceChecker:
     
     def generate_report(self):
         """Generate a comprehensive compliance report."""
-        print("\n" + "="*60)
-        print("PCI DSS COMPLIANCE REPORT")
-        print("="*60)
+        # Build the whole report and emit it with one write
+        lines = ["", "=" * 60, "PCI DSS COMPLIANCE REPORT", "=" * 60]
+        
+        lines.append(f"\n✅ Compliance Checks Passed: {len(self.compliance_passed)}")
+        lines.extend(f"   • {check}" for check in self.compliance_passed)
         
-        print(f"\n✅ Compliance Checks Passed: {len(self.compliance_passed)}")
-        for check in self.compliance_passed:
-            print(f"   • {check}")
+        lines.append(f"\n❌ Compliance Issues Found: {len(self.compliance_issues)}")
+        lines.extend(f"   • {issue['check']}: {issue['details']}" for issue in self.compliance_issues)
         
-        print(f"\n❌ Compliance Issues Found: {len(self.compliance_issues)}")
-        for issue in self.compliance_issues:
-            print(f"   • {issue['check']}: {issue['details']}")
+        if self.compliance_warnings:
+            lines.append(f"\n⚠️  Warnings: {len(self.compliance_warnings)}")
+            lines.extend(f"   • {warning['check']}: {warning['details']}" for warning in self.compliance_warnings)
         
         # Overall compliance status
-        if len(self.compliance_issues) == 0:
-            print("\n🎉 OVERALL COMPLIANCE: PASSED")
-            print("   All critical PCI DSS requirements are met.")
-            return True
+        compliance_passed = len(self.compliance_issues) == 0
+        if compliance_passed:
+            lines.append("\n🎉 OVERALL COMPLIANCE: PASSED")
+            lines.append("   All critical PCI DSS requirements are met.")
         else:
-            print("\n🚨 OVERALL COMPLIANCE: REQUIRES ATTENTION")
-            print(f"   {len(self.compliance_issues)} issues must be addressed.")
-            return False
+            lines.append("\n🚨 OVERALL COMPLIANCE: REQUIRES ATTENTION")
+            lines.append(f"   {len(self.compliance_issues)} issues must be addressed.")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
+        return compliance_passed
     
     def run_all_checks(self):
         """Run all PCI compliance checks."""
@@ -422,5 +610,11 @@ class PCIComplianceChecker:
 
 
 if __name__ == "__main__":
+    # Setup Django
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iretilightpos.settings.base')
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    django.setup()
+    
     checker = PCIComplianceChecker()
     checker.run_all_checks()
@@ -7,10 +7,18 @@ Tests security measures and compliance using Stripe services
 import os
 import sys
 import json
-import hashlib
 import hmac
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Add Django setup
 sys.path.insert(0, '/workspaces/ireti-pos-light')
@@ -20,6 +28,7 @@ import django
 django.setup()
 
 from django.conf import settings
+from django.db import connection
 from payments.services import stripe_service
 from payments.logging_utils import secure_log_payment_event
 from payments.decorators import payment_processor_required
@@ -27,10 +36,23 @@ from django.contrib.auth.models import User, Permission
 from django.test import RequestFactory
 from django.http import HttpRequest
 
+# Both secret key prefixes are 8 characters long
+_SECRET_KEY_PREFIXES = frozenset({'sk_test_', 'sk_live_'})
+
+
+@lru_cache(maxsize=8)
+def _is_valid_secret(key):
+    """Check that a Stripe secret key has a test or live prefix"""
+    return key[:8] in _SECRET_KEY_PREFIXES
+
+
 class SecurityTestSuite:
     def __init__(self):
         self.test_results = []
         self.factory = RequestFactory()
+        self._results_lock = threading.Lock()
+        # Per-worker output buffer, returned as one block when the test finishes
+        self._output = threading.local()
         
     def log_test_result(self, test_name, status, details):
         """Log test results"""
@@ -40,19 +62,38 @@ class SecurityTestSuite:
             'details': details,
             'timestamp': datetime.now().isoformat()
         }
-        self.test_results.append(result)
-        
         status_emoji = "✅" if status == "PASS" else "❌" if status == "FAIL" else "⚠️"
-        print(f"{status_emoji} {test_name}: {details}")
+        with self._results_lock:
+            self.test_results.append(result)
+        self._emit(f"{status_emoji} {test_name}: {details}")
+
+    def _emit(self, line):
+        """Buffer a line of a running test's output, or print it outside run_test"""
+        lines = getattr(self._output, 'lines', None)
+        if lines is None:
+            print(line)
+        else:
+            lines.append(line)
+
+    def run_test(self, test):
+        """Run one test in a worker thread and return its output as a single block"""
+        self._output.lines = []
+        try:
+            test()
+        finally:
+            lines, self._output.lines = self._output.lines, None
+            # Each worker thread opens its own DB connection
+            connection.close()
+        return "\n".join(lines)
         
     def test_stripe_service_security(self):
         """Test Stripe service security configuration"""
-        print("\n🔐 Testing Stripe Service Security...")
+        self._emit("\n🔐 Testing Stripe Service Security...")
         
         try:
             # Test API key validation
             if hasattr(stripe_service, 'secret_key'):
-                if stripe_service.secret_key.startswith(('sk_test_', 'sk_live_')):
+                if _is_valid_secret(stripe_service.secret_key):
                     self.log_test_result("Stripe API Key Format", "PASS", "Secret key format is valid")
                 else:
                     self.log_test_result("Stripe API Key Format", "FAIL", "Invalid secret key format")
@@ -70,11 +111,11 @@ class SecurityTestSuite:
             
     def test_webhook_signature_verification(self):
         """Test webhook signature verification security"""
-        print("\n🔗 Testing Webhook Security...")
+        self._emit("\n🔗 Testing Webhook Security...")
         
         try:
-            # Create test webhook payload
-            test_payload = json.dumps({
+            # Create test webhook payload as bytes, ready for signing and verification
+            test_event = {
                 "id": "evt_test_webhook",
                 "object": "event",
                 "type": "payment_intent.succeeded",
@@ -84,27 +125,28 @@ class SecurityTestSuite:
                         "status": "succeeded"
                     }
                 }
-            })
+            }
+            if ORJSON_AVAILABLE:
+                payload_bytes = orjson.dumps(test_event)
+            else:
+                payload_bytes = json.dumps(test_event).encode('utf-8')
             
             # Test with valid signature (if webhook secret is configured)
             webhook_secret = getattr(settings, 'STRIPE_WEBHOOK_ENDPOINT_SECRET', None)
             if webhook_secret:
                 timestamp = str(int(time.time()))
-                signature_payload = timestamp + "." + test_payload
-                signature = hmac.new(
+                signature_payload = timestamp.encode() + b"." + payload_bytes
+                signature = hmac.digest(
                     webhook_secret.encode('utf-8'),
-                    signature_payload.encode('utf-8'),
-                    hashlib.sha256
-                ).hexdigest()
+                    signature_payload,
+                    'sha256'
+                ).hex()
                 
                 test_signature = f"t={timestamp},v1={signature}"
                 
                 # Test signature verification
                 if hasattr(stripe_service, 'verify_webhook_signature'):
                     try:
-                        # Convert string payload to bytes for proper signature verification
-                        payload_bytes = test_payload.encode('utf-8') if isinstance(test_payload, str) else test_payload
-                        
                         # This should pass with valid signature
                         result = stripe_service.verify_webhook_signature(payload_bytes, test_signature)
                         if result:
@@ -142,7 +184,7 @@ class SecurityTestSuite:
             
     def test_access_control_decorators(self):
         """Test role-based access control decorators"""
-        print("\n👥 Testing Access Control...")
+        self._emit("\n👥 Testing Access Control...")
         
         try:
             from payments.decorators import (
@@ -199,7 +241,7 @@ class SecurityTestSuite:
             
     def test_secure_logging(self):
         """Test secure logging with data redaction"""
-        print("\n📝 Testing Secure Logging...")
+        self._emit("\n📝 Testing Secure Logging...")
         
         try:
             from payments.logging_utils import redact_sensitive_data, secure_log_payment_event
@@ -243,43 +285,44 @@ class SecurityTestSuite:
             
     def test_https_security_headers(self):
         """Test HTTPS and security headers configuration"""
-        print("\n🔒 Testing HTTPS Security Configuration...")
+        self._emit("\n🔒 Testing HTTPS Security Configuration...")
         
         try:
             # Check production security settings
             prod_settings_file = '/workspaces/ireti-pos-light/iretilightpos/settings/production.py'
-            if os.path.exists(prod_settings_file):
-                with open(prod_settings_file, 'r') as f:
+            try:
+                with open(prod_settings_file, 'rb') as f:
                     content = f.read()
-                    
-                required_settings = [
-                    'SESSION_COOKIE_SECURE = True',
-                    'CSRF_COOKIE_SECURE = True',
-                    'SECURE_SSL_REDIRECT = True',
-                    'SECURE_HSTS_SECONDS = 31536000'
-                ]
-                
-                missing_settings = []
-                for setting in required_settings:
-                    if setting not in content:
-                        missing_settings.append(setting)
-                
-                if not missing_settings:
-                    self.log_test_result("Production HTTPS Settings", "PASS", 
-                                       "All required HTTPS settings configured")
-                else:
-                    self.log_test_result("Production HTTPS Settings", "FAIL", 
-                                       f"Missing settings: {missing_settings}")
-            else:
+            except FileNotFoundError:
                 self.log_test_result("Production Settings File", "FAIL", 
                                    "Production settings file not found")
+                return
+                
+            required_settings = [
+                b'SESSION_COOKIE_SECURE = True',
+                b'CSRF_COOKIE_SECURE = True',
+                b'SECURE_SSL_REDIRECT = True',
+                b'SECURE_HSTS_SECONDS = 31536000'
+            ]
+            
+            missing_settings = []
+            for setting in required_settings:
+                if setting not in content:
+                    missing_settings.append(setting.decode())
+            
+            if not missing_settings:
+                self.log_test_result("Production HTTPS Settings", "PASS", 
+                                   "All required HTTPS settings configured")
+            else:
+                self.log_test_result("Production HTTPS Settings", "FAIL", 
+                                   f"Missing settings: {missing_settings}")
                 
         except Exception as e:
             self.log_test_result("HTTPS Security Test", "FAIL", f"Exception: {str(e)}")
             
     def test_environment_security(self):
         """Test environment variable security"""
-        print("\n🔑 Testing Environment Security...")
+        self._emit("\n🔑 Testing Environment Security...")
         
         try:
             # Check for required environment variables
@@ -299,7 +342,7 @@ class SecurityTestSuite:
             
             # Check secret key format
             secret_key = os.getenv('STRIPE_SECRET_KEY', '')
-            if secret_key.startswith(('sk_test_', 'sk_live_')):
+            if _is_valid_secret(secret_key):
                 self.log_test_result("Secret Key Format", "PASS", 
                                    "Stripe secret key has valid format")
             else:
@@ -311,7 +354,7 @@ class SecurityTestSuite:
             
     def test_no_cardholder_data_storage(self):
         """Test that no cardholder data is stored"""
-        print("\n💳 Testing Cardholder Data Storage Policy...")
+        self._emit("\n💳 Testing Cardholder Data Storage Policy...")
         
         try:
             from django.apps import apps
@@ -345,6 +388,8 @@ class SecurityTestSuite:
         print("PCI DSS SECURITY TEST REPORT")
         print("="*80)
         
+        # Workers finish in any order; report by test name so runs are comparable
+        self.test_results.sort(key=lambda r: r['test'])
         total_tests = len(self.test_results)
         passed_tests = len([r for r in self.test_results if r['status'] == 'PASS'])
         failed_tests = len([r for r in self.test_results if r['status'] == 'FAIL'])
@@ -391,14 +436,20 @@ def main():
     
     suite = SecurityTestSuite()
     
-    # Run all security tests
-    suite.test_stripe_service_security()
-    suite.test_webhook_signature_verification()
-    suite.test_access_control_decorators()
-    suite.test_secure_logging()
-    suite.test_https_security_headers()
-    suite.test_environment_security()
-    suite.test_no_cardholder_data_storage()
+    # Run all security tests; they are independent, so overlap their I/O
+    tests = [
+        suite.test_stripe_service_security,
+        suite.test_webhook_signature_verification,
+        suite.test_access_control_decorators,
+        suite.test_secure_logging,
+        suite.test_https_security_headers,
+        suite.test_environment_security,
+        suite.test_no_cardholder_data_storage,
+    ]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        # map() yields in submission order, so each test's block prints under its own header
+        for output in executor.map(suite.run_test, tests):
+            print(output)
     
     # Generate report
     report = suite.generate_security_report()
@@ -407,8 +458,17 @@ def main():
     report_file = '/workspaces/ireti-pos-light/logs/security_test_report.json'
     os.makedirs(os.path.dirname(report_file), exist_ok=True)
     
-    with open(report_file, 'w') as f:
-        json.dump(report, f, indent=2)
+    if ORJSON_AVAILABLE:
+        # orjson emits UTF-8 bytes directly, so write them in a single call
+        data = orjson.dumps(report, option=orjson.OPT_INDENT_2)
+        fd = os.open(report_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+    else:
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
     
     print(f"\n📄 Detailed report saved to: {report_file}")
     
@@ -5,9 +5,45 @@ Validate Stripe configuration helper (moved to scripts/)
 
 import os
 import re
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+STRIPE_VAR = re.compile(r'\bSTRIPE_[A-Z_]+\b')
+
+# (path relative to the project root, Stripe names the file must reference)
+FILES = [
+    ('.env.example', ('STRIPE_PUBLISHABLE_KEY', 'STRIPE_SECRET_KEY', 'STRIPE_WEBHOOK_ENDPOINT_SECRET')),
+    ('iretilightpos/settings/base.py', ('STRIPE_PUBLISHABLE_KEY', 'STRIPE_SECRET_KEY', 'STRIPE_WEBHOOK_ENDPOINT_SECRET')),
+    ('payments/services.py', ('STRIPE_SECRET_KEY', 'STRIPE_WEBHOOK_ENDPOINT_SECRET')),
+    ('iretilightpos/templates/stripe_payment.html', ('STRIPE_PUBLISHABLE_KEY',)),
+]
+
+
+def check(path, required):
+    """Read the file once and report any required Stripe names it does not reference."""
+    full_path = BASE_DIR / path
+    try:
+        content = full_path.read_text()
+    except OSError:
+        print(f"❌ {path}: not found")
+        return False
+    missing = set(required) - set(STRIPE_VAR.findall(content))
+    if missing:
+        print(f"❌ {path}: missing {', '.join(sorted(missing))}")
+        return False
+    print(f"✅ {path}")
+    return True
+
 
 def main():
-    print("Validate Stripe configuration placeholder")
+    print("Validate Stripe configuration")
+    checks = [check(path, required) for path, required in FILES]
+    if not os.environ.get('STRIPE_SECRET_KEY'):
+        print("⚠️  STRIPE_SECRET_KEY is not set in the environment")
+    return 0 if all(checks) else 1
+
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
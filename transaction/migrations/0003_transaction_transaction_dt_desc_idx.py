@@ -0,0 +1,19 @@
+# Generated by Django 4.2.26 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transaction", "0002_alter_transaction_payment_type"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["-transaction_dt"], name="transaction_dt_desc_idx"
+            ),
+        ),
+    ]
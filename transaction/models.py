@@ -3,6 +3,8 @@ from django.db import models
 from django.conf import settings
 from django.db.models import F
 from inventory.models import product, PERCENTAGE_VALIDATOR
+import ast
+import json
 import pytz
 timezone = pytz.timezone("US/Eastern")
 
@@ -48,10 +50,17 @@ class transaction(models.Model):
         latest_payment = payment_transactions.order_by('-created_at').first()
         return latest_payment.status if latest_payment else 'pending'
 
+    def product_list(self):
+        """Decode the stored cart records (JSON, or repr() for legacy rows)"""
+        try:
+            return json.loads(self.products)
+        except ValueError:
+            return ast.literal_eval(self.products)
+
     def save(self,*args,**kwargs):
         self.transaction_dt = timezone.localize(self.transaction_dt)
         super().save(*args, **kwargs)
-        for product_item in eval(self.products):
+        for product_item in self.product_list():
             try: item = product.objects.get(barcode = product_item['barcode'])
             except: item = product.objects.get(barcode = product_item['barcode'].split("_")[0])
             productTransaction.objects.create(transaction = self, transaction_id_num = self.transaction_id, transaction_date_time = self.transaction_dt,
@@ -63,6 +72,10 @@ class transaction(models.Model):
 
     class Meta:
         verbose_name_plural = "Transactions"
+        indexes = [
+            # Matches the newest-first date-range listing in transactionView
+            models.Index(fields=['-transaction_dt'], name='transaction_dt_desc_idx'),
+        ]
 
 
 class productTransaction(models.Model):
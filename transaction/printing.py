@@ -0,0 +1,94 @@
+"""Receipt printing on the USB ESC/POS printer.
+
+Receipts are queued and written by one background worker so requests never wait on USB I/O.
+"""
+from contextlib import suppress
+from datetime import datetime
+from time import sleep
+import queue
+import threading
+
+from django.conf import settings
+from escpos.printer import Usb
+from usb.core import USBError
+
+
+def _usb_id(value):
+    """Parse a USB vendor/product id such as '0x04b8' (no eval of settings)."""
+    try:
+        return int(str(value), 0)
+    except ValueError:
+        return None
+
+# Resolved once at import instead of on every reconnect
+PRINTER_VENDOR_ID = _usb_id(getattr(settings, 'PRINTER_VENDOR_ID', ''))
+PRINTER_PRODUCT_ID = _usb_id(getattr(settings, 'PRINTER_PRODUCT_ID', ''))
+PRINT_ATTEMPTS = 3
+
+# Open printer device, or None; guarded by _lock
+_device = None
+# Serializes USB access between the print worker and reconnects
+_lock = threading.Lock()
+_queue = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def print_receipt(text):
+    """Queue a receipt for the print worker and return immediately."""
+    _ensure_worker()
+    _queue.put((text, PRINT_ATTEMPTS))
+
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_worker_loop, name="receipt-printer", daemon=True)
+            _worker.start()
+
+
+def _worker_loop():
+    while True:
+        text, attempts = _queue.get()
+        try:
+            _write_receipt(text, attempts)
+        except Exception as e:
+            # Keep the worker alive for the next receipt
+            print(e)
+        finally:
+            _queue.task_done()
+
+
+def _write_receipt(text, attempts=PRINT_ATTEMPTS):
+    """Write a receipt to the device, reopening it after a USB error (print worker only)."""
+    global _device
+    with _lock:
+        for attempt in range(attempts):
+            if _device is None:
+                _connect()
+            if _device is None:
+                return
+            try:
+                _device.text(text)
+                _device.text(f"\nPrint Time: {datetime.now():%Y-%m-%d %H:%M}\n\n\n")
+                return
+            except USBError as e:
+                print(e)
+                with suppress(Exception):
+                    _device.close()
+                _device = None
+                sleep(0.1)
+
+
+def _connect():
+    # Callers must hold _lock
+    global _device
+    if PRINTER_VENDOR_ID is None or PRINTER_PRODUCT_ID is None:
+        _device = None
+        return
+    try:
+        _device = Usb(PRINTER_VENDOR_ID, PRINTER_PRODUCT_ID)
+    except Exception as e:
+        print(e)
+        _device = None
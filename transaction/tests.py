@@ -1,3 +1,333 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from decimal import Decimal
+from datetime import date, datetime
+from unittest.mock import patch
+import json
+
+from payments.models import PaymentTransaction
+from .models import transaction
+from .views import PENDING_RECEIPT, SUSPENDED_IDS_SESSION_KEY, _cart_totals, _get_receipt, _receipt_items
 
 # Create your tests here.
+
+
+def make_stripe_transaction(user, transaction_id='STRIPE001', receipt=PENDING_RECEIPT):
+    """Create a STRIPE transaction with no products, so save() touches no inventory."""
+    return transaction.objects.create(
+        transaction_id=transaction_id,
+        transaction_dt=datetime(2025, 9, 2, 12, 0, 0),
+        user=user,
+        total_sale=Decimal('21.98'),
+        sub_total=Decimal('20.00'),
+        tax_total=Decimal('1.98'),
+        deposit_total=Decimal('0.00'),
+        payment_type='STRIPE',
+        receipt=receipt,
+        products='[]',
+    )
+
+
+class CartTotalsTest(TestCase):
+    """Test the Decimal cart totals used by checkout."""
+
+    def test_totals_are_exact_decimals(self):
+        """Summing string amounts gives exact, quantized Decimals."""
+        cart = {
+            str(i): {'line_total': '0.10', 'tax_value': '0.01', 'deposit_value': '0.05'}
+            for i in range(3)
+        }
+        total, tax_total, deposit_total = _cart_totals(cart)
+        self.assertEqual((total, tax_total, deposit_total), (Decimal('0.30'), Decimal('0.03'), Decimal('0.15')))
+        self.assertEqual(str(total), '0.30')
+
+    def test_returned_items_reduce_totals(self):
+        """Returned items carry negative float values and are subtracted exactly."""
+        cart = {
+            '1': {'line_total': '5.25', 'tax_value': '0.25', 'deposit_value': '0.00'},
+            '2': {'line_total': -1.1, 'tax_value': -0.1, 'deposit_value': 0.0},
+        }
+        self.assertEqual(_cart_totals(cart), (Decimal('4.15'), Decimal('0.15'), Decimal('0.00')))
+
+    def test_empty_cart(self):
+        """An empty cart totals to zero."""
+        self.assertEqual(_cart_totals({}), (Decimal('0.00'), Decimal('0.00'), Decimal('0.00')))
+
+
+class ReceiptItemsTest(TestCase):
+    """Test the item lines of a receipt."""
+
+    def test_item_lines_layout(self):
+        """Deposits print as floats and taxed items are flagged, right-aligned to the receipt width."""
+        width = settings.RECEIPT_CHAR_COUNT
+        rows = [
+            {'barcode': '123', 'name': 'Bottled Water', 'price': '1.00', 'quantity': 2,
+             'tax_value': '0.14', 'deposit_value': '0.10'},
+            {'barcode': '456', 'name': 'Bread', 'price': '2.50', 'quantity': 1,
+             'tax_value': '0.00', 'deposit_value': '0.00'},
+        ]
+        expected = "\n".join([
+            "1)  Bottled Water".ljust(width),
+            " 123            2   1.00   0.1 T".rjust(width),
+            "2)  Bread".ljust(width),
+            " 456            1   2.50        ".rjust(width),
+        ])
+        self.assertEqual(_receipt_items(rows), expected)
+
+
+class EndTransactionTest(TestCase):
+    """Test the cash checkout input handling."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='cashier')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        session = self.client.session
+        session[settings.CART_SESSION_ID] = {
+            '123': {'barcode': '123', 'name': 'Item', 'price': '1.00', 'quantity': 1,
+                    'tax_value': '0.00', 'deposit_value': '0.00', 'line_total': '1.00'},
+        }
+        session.save()
+
+    def test_invalid_cash_value_redirects_to_register(self):
+        """A non-numeric cash amount (InvalidOperation) returns to the register without a sale."""
+        response = self.client.get(reverse('endTransaction', args=['cash', 'abc']))
+        self.assertRedirects(response, reverse('register'), fetch_redirect_response=False)
+        self.assertFalse(transaction.objects.exists())
+
+    def test_insufficient_cash_redirects_to_register(self):
+        """Cash below the cart total does not complete the sale."""
+        response = self.client.get(reverse('endTransaction', args=['cash', '0.99']))
+        self.assertRedirects(response, reverse('register'), fetch_redirect_response=False)
+        self.assertFalse(transaction.objects.exists())
+
+
+class TransactionViewTest(TestCase):
+    """Test the paginated transaction list."""
+
+    day = date(2025, 9, 2)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='cashier')
+        # bulk_create skips transaction.save(), so pass an aware datetime directly
+        dt = timezone.make_aware(datetime.combine(cls.day, datetime.min.time()).replace(hour=12))
+        transaction.objects.bulk_create(
+            transaction(transaction_id=f"T{i:04d}", transaction_dt=dt, user=cls.user,
+                        total_sale=Decimal('1.00'), sub_total=Decimal('1.00'), tax_total=Decimal('0.00'),
+                        deposit_total=Decimal('0.00'), payment_type='CASH', receipt='r', products='[]')
+            for i in range(150)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def range_data(self):
+        return {
+            'start_date_year': self.day.year, 'start_date_month': self.day.month, 'start_date_day': self.day.day,
+            'end_date_year': self.day.year, 'end_date_month': self.day.month, 'end_date_day': self.day.day,
+        }
+
+    def test_page_links_keep_the_range(self):
+        """GET page links page through the selected range."""
+        response = self.client.get(reverse('transactionView'), {
+            'start_date': self.day.isoformat(), 'end_date': self.day.isoformat(), 'page': 2})
+        self.assertEqual(response.context['transactions'].number, 2)
+        self.assertEqual(len(response.context['transactions']), 50)
+
+    def test_posted_range_starts_on_first_page(self):
+        """Posting a range from a later page shows page 1 of the new results."""
+        response = self.client.post(reverse('transactionView') + '?page=2', self.range_data())
+        self.assertEqual(response.context['transactions'].number, 1)
+        self.assertEqual(len(response.context['transactions']), 100)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'suspended_carts': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'suspended-test'},
+})
+class SuspendRecallTest(TestCase):
+    """Test suspending and recalling carts."""
+
+    cart = {'123': {'barcode': '123', 'name': 'Item', 'price': '1.00', 'quantity': 1,
+                    'tax_value': '0.00', 'deposit_value': '0.00', 'line_total': '1.00'}}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='cashier')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def set_cart(self, cart):
+        session = self.client.session
+        session[settings.CART_SESSION_ID] = cart
+        session.save()
+
+    def test_suspend_and_recall(self):
+        """A suspended cart is listed and restored by its id, then forgotten."""
+        self.set_cart(self.cart)
+        self.client.get(reverse('suspend_transaction'))
+        ids = self.client.session[SUSPENDED_IDS_SESSION_KEY]
+        self.assertEqual(len(ids), 1)
+
+        self.set_cart({})
+        response = self.client.get(reverse('recall_transaction'))
+        self.assertEqual(list(response.context['obj_rt']), ids)
+
+        self.client.get(reverse('recall_transaction_no', args=[ids[0]]))
+        self.assertEqual(self.client.session[settings.CART_SESSION_ID], self.cart)
+        self.assertEqual(self.client.session[SUSPENDED_IDS_SESSION_KEY], [])
+
+    def test_other_session_does_not_see_carts(self):
+        """Suspended carts are per session, not per user."""
+        self.set_cart(self.cart)
+        self.client.get(reverse('suspend_transaction'))
+
+        other = self.client_class()
+        other.force_login(self.user)
+        response = other.get(reverse('recall_transaction'))
+        self.assertRedirects(response, reverse('register'), fetch_redirect_response=False)
+
+
+class ProductListTest(TestCase):
+    """Test decoding of the stored cart records."""
+
+    records = [{'barcode': '123', 'name': 'Item', 'price': '1.00', 'quantity': 2, 'line_no': 1}]
+
+    def test_json_products(self):
+        """Products stored as JSON are decoded."""
+        self.assertEqual(transaction(products=json.dumps(self.records)).product_list(), self.records)
+
+    def test_legacy_repr_products(self):
+        """Rows stored with repr() before the JSON switch still decode."""
+        self.assertEqual(transaction(products=repr(self.records)).product_list(), self.records)
+
+
+class StripePaymentViewsTest(TestCase):
+    """Test the Stripe payment intent, status and completion views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='cashier')
+
+    def setUp(self):
+        # Receipts are cached by transaction id, which the tests reuse
+        cache.clear()
+        self.client.force_login(self.user)
+        self.obj = make_stripe_transaction(self.user)
+
+    def add_payment(self, status, **kwargs):
+        return PaymentTransaction.objects.create(
+            transaction=self.obj,
+            amount=Decimal('21.98'),
+            status=status,
+            stripe_payment_intent_id=kwargs.pop('intent_id', 'pi_test_123'),
+            **kwargs
+        )
+
+    @patch('transaction.views.StripePaymentService.create_payment_intent')
+    def test_intent_reuses_existing_client_secret(self, mock_create):
+        """Reloading the payment page returns the linked intent's secret without calling Stripe."""
+        self.add_payment('pending', stripe_status='requires_payment_method',
+                         stripe_client_secret='pi_test_123_secret')
+        response = self.client.post(reverse('stripe_payment_intent', args=[self.obj.transaction_id]))
+        self.assertEqual(response.json(), {'client_secret': 'pi_test_123_secret'})
+        mock_create.assert_not_called()
+
+    @patch('transaction.views.StripePaymentService.create_payment_intent')
+    def test_intent_not_reused_after_cancel(self, mock_create):
+        """A canceled intent's secret can no longer be confirmed, so a new intent is created."""
+        self.add_payment('canceled', stripe_status='canceled', stripe_client_secret='pi_test_123_secret')
+        mock_create.return_value = {
+            'id': 'pi_test_new',
+            'amount': 2198,
+            'currency': 'usd',
+            'status': 'requires_payment_method',
+            'client_secret': 'pi_test_new_secret',
+            'metadata': {'transaction_id': self.obj.transaction_id},
+        }
+        response = self.client.post(reverse('stripe_payment_intent', args=[self.obj.transaction_id]))
+        self.assertEqual(response.json(), {'client_secret': 'pi_test_new_secret'})
+        mock_create.assert_called_once()
+
+    @patch('transaction.views.StripePaymentService.create_payment_intent')
+    def test_intent_created_and_linked(self, mock_create):
+        """Without a linked intent one is created and linked to the transaction."""
+        mock_create.return_value = {
+            'id': 'pi_test_new',
+            'amount': 2198,
+            'currency': 'usd',
+            'status': 'requires_payment_method',
+            'client_secret': 'pi_test_new_secret',
+            'metadata': {'transaction_id': self.obj.transaction_id},
+        }
+        response = self.client.post(reverse('stripe_payment_intent', args=[self.obj.transaction_id]))
+        self.assertEqual(response.json(), {'client_secret': 'pi_test_new_secret'})
+        self.assertTrue(PaymentTransaction.objects.filter(
+            transaction=self.obj, stripe_payment_intent_id='pi_test_new').exists())
+
+    def test_intent_requires_post(self):
+        """The intent endpoint only accepts POST."""
+        response = self.client.get(reverse('stripe_payment_intent', args=[self.obj.transaction_id]))
+        self.assertEqual(response.status_code, 405)
+
+    def status_json(self):
+        return self.client.get(reverse('stripe_payment_status', args=[self.obj.transaction_id])).json()
+
+    def test_status_pending_without_payment(self):
+        """A transaction with no payment record yet is pending."""
+        self.assertEqual(self.status_json(), {'status': 'pending', 'final': False})
+
+    def test_status_succeeded_is_final(self):
+        """A succeeded payment is final."""
+        self.add_payment('succeeded')
+        self.assertEqual(self.status_json(), {'status': 'succeeded', 'final': True})
+
+    def test_status_fresh_requires_payment_method_is_pending(self):
+        """A new intent's requires_payment_method status is not a failure."""
+        self.add_payment('requires_payment_method')
+        self.assertEqual(self.status_json(), {'status': 'requires_payment_method', 'final': False})
+
+    def test_status_declined_requires_payment_method_is_final(self):
+        """requires_payment_method after a declined attempt is final."""
+        self.add_payment('requires_payment_method', last_payment_error=json.dumps({'code': 'card_declined'}))
+        self.assertEqual(self.status_json()['final'], True)
+
+    def test_complete_pending_renders_pending_page(self):
+        """Before the webhook arrives the pending page is shown."""
+        self.add_payment('requires_payment_method')
+        response = self.client.get(reverse('complete_stripe_payment', args=[self.obj.transaction_id]))
+        self.assertTemplateUsed(response, 'stripe_payment_pending.html')
+
+    def test_complete_failed_renders_failed_page(self):
+        """A failed payment shows the failed page and keeps the pending receipt."""
+        self.add_payment('failed')
+        response = self.client.get(reverse('complete_stripe_payment', args=[self.obj.transaction_id]))
+        self.assertTemplateUsed(response, 'stripe_payment_failed.html')
+        self.obj.refresh_from_db()
+        self.assertEqual(self.obj.receipt, PENDING_RECEIPT)
+
+    def test_complete_succeeded_writes_receipt(self):
+        """A succeeded payment replaces the pending receipt and shows the end screen."""
+        self.add_payment('succeeded')
+        response = self.client.get(reverse('complete_stripe_payment', args=[self.obj.transaction_id]))
+        self.assertTemplateUsed(response, 'endTransaction.html')
+        self.assertContains(response, 'STRIPE PAYMENT SUCCESSFUL')
+        self.obj.refresh_from_db()
+        self.assertNotEqual(self.obj.receipt, PENDING_RECEIPT)
+        self.assertIn(f"Transaction:{self.obj.transaction_id}", self.obj.receipt)
+
+    def test_pending_receipt_is_not_cached(self):
+        """The pending placeholder is re-read until the final receipt is written."""
+        self.assertEqual(_get_receipt(self.obj.transaction_id), PENDING_RECEIPT)
+        transaction.objects.filter(pk=self.obj.pk).update(receipt='Final receipt')
+        self.assertEqual(_get_receipt(self.obj.transaction_id), 'Final receipt')
+        transaction.objects.filter(pk=self.obj.pk).update(receipt='Changed receipt')
+        self.assertEqual(_get_receipt(self.obj.transaction_id), 'Final receipt')
@@ -1,63 +1,157 @@
 from django.shortcuts import redirect, render
-from django.http import Http404, HttpResponse
+from django.template.loader import render_to_string
+from django.http import Http404, HttpResponse, JsonResponse
 from django.conf import settings 
 from cart.models import Cart
-import pandas as pd
 from .models import transaction
-from datetime import datetime, timedelta
+from .printing import print_receipt
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+from django.core.paginator import Paginator
+from django.core.cache import cache, caches
+from urllib.parse import urlencode
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_POST
+from django.db import transaction as db_transaction
 from django import forms
-from escpos.printer import Usb
 from decimal import Decimal
+import json
+import uuid
+from functools import lru_cache
 
 # Stripe payment integration imports
 from payments.services import StripePaymentService
 from payments.models import PaymentTransaction
 
+CENT = Decimal('0.01')
+# Receipts never change once a transaction is complete, so reprints are served from the cache
+RECEIPT_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+# Placeholder receipt of a Stripe transaction until complete_stripe_payment rewrites it
+PENDING_RECEIPT = 'Payment pending...'
+# Session key holding the cache namespace of the session's suspended carts
+SUSPENDED_SCOPE_SESSION_KEY = 'suspended_carts_id'
+# Session key listing the ids of the session's suspended carts
+SUSPENDED_IDS_SESSION_KEY = 'suspended_cart_ids'
+# PaymentTransaction statuses after which a Stripe payment will not succeed
+STRIPE_FAILED_STATUSES = ('failed', 'canceled')
+# Stripe intent statuses whose client secret can still be confirmed by the payment page
+STRIPE_REUSABLE_STATUSES = ('requires_payment_method', 'requires_confirmation', 'requires_action')
+# Receipt item line templates, formatted once per cart row
+_ROW_NAME_TPL = "{idx:<3} {name}"
+_ROW_DETAIL_TPL = " {barcode:<13}{qty:>3}{price:>7}{deposit:>6}{tax:>2}"
+
+
+def _cart_totals(cart):
+    """Return (total, tax_total, deposit_total) of the cart as exact Decimals, in one pass."""
+    total = tax_total = deposit_total = Decimal('0')
+    for item in cart.values():
+        total += Decimal(str(item['line_total']))
+        tax_total += Decimal(str(item['tax_value']))
+        deposit_total += Decimal(str(item['deposit_value']))
+    return total.quantize(CENT), tax_total.quantize(CENT), deposit_total.quantize(CENT)
+
+
+def _stripe_payment_failed(obj, status):
+    """
+    True once a Stripe payment can no longer succeed. Every PaymentIntent
+    starts in requires_payment_method, so that status only counts as failed
+    after a declined attempt has recorded a last_payment_error.
+    """
+    if status in STRIPE_FAILED_STATUSES:
+        return True
+    if status != 'requires_payment_method':
+        return False
+    latest = obj.payment_transactions.order_by('-created_at').only('last_payment_error').first()
+    return bool(latest and latest.last_payment_error and latest.last_payment_error != '{}')
+
+
+def _receipt_cache_key(transNo):
+    return f"receipt:{transNo}"
+
+
+def _get_receipt(transNo):
+    """Return a transaction's receipt text, from the cache when possible."""
+    receipt = cache.get(_receipt_cache_key(transNo))
+    if receipt is None:
+        receipt = transaction.objects.only('receipt').get(transaction_id=transNo).receipt
+        # Only final receipts are cached; a pending Stripe receipt is rewritten on completion
+        if receipt != PENDING_RECEIPT:
+            cache.set(_receipt_cache_key(transNo), receipt, RECEIPT_CACHE_TIMEOUT)
+    return receipt
+
+
+def _cart_records(cart):
+    """Numbered list of the cart items, as stored in transaction.products."""
+    return [dict(item, line_no=i) for i, item in enumerate(cart.values(), 1)]
+
+
+def _receipt_items(rows):
+    """Format cart rows as the numbered two-line item block of a receipt."""
+    width = settings.RECEIPT_CHAR_COUNT
+    lines = []
+    for i, row in enumerate(rows, 1):
+        tax_value = float(row['tax_value'])
+        deposit_value = float(row['deposit_value'])
+        fields = {
+            'idx': f"{i})",
+            'name': row['name'][:28],
+            'barcode': row['barcode'],
+            'qty': row['quantity'],
+            'price': row['price'],
+            # Printed as a float (0.1, not 0.10), as the receipt always has
+            'deposit': "" if deposit_value == 0 else deposit_value,
+            'tax': "T" if tax_value > 0 else "-T" if tax_value < 0 else "",
+        }
+        lines.append(_ROW_NAME_TPL.format_map(fields).ljust(width) + "\n" +
+                     _ROW_DETAIL_TPL.format_map(fields).rjust(width))
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=1)
+def _receipt_frame():
+    """Centered header and footer lines; the receipt settings never change at runtime."""
+    width = settings.RECEIPT_CHAR_COUNT
+    blank = "".center(width)
+    header = [line.center(width) for line in settings.RECEIPT_HEADER.split("\n")]
+    footer = [line.center(width) for line in settings.RECEIPT_FOOTER.splitlines()]
+    return header + [blank], [blank] + footer
+
+
+def _center_receipt(body):
+    """Center the per-transaction body between the cached header and footer."""
+    header, footer = _receipt_frame()
+    width = settings.RECEIPT_CHAR_COUNT
+    return "\n".join(header + [line.center(width) for line in body.split("\n")] + footer)
+
 @login_required(login_url="/user/login/")
 def start_stripe_payment(request):
     """
-    Initiate a Stripe payment for the current cart and redirect to Stripe payment page.
+    Record a pending Stripe transaction for the current cart and render the Stripe payment page.
     """
     try:
         cart = request.session[settings.CART_SESSION_ID]
-        total = round(pd.DataFrame(cart).T["line_total"].astype(float).sum(), 2)
+        total, tax_total, deposit_total = _cart_totals(cart)
         user = request.user
-        transaction_id = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        now = datetime.now()
+        transaction_id = now.strftime('%Y%m%d%H%M%S%f')
         
         # Create transaction with payment_type STRIPE but incomplete receipt
-        cart_df = pd.DataFrame(cart).T.reset_index(drop=True)
-        cart_df.index = cart_df.index + 1
-        tax_total = round(cart_df["tax_value"].astype(float).sum(), 2)
-        deposit_total = round(cart_df["deposit_value"].astype(float).sum(), 2)
-        
-        new_transaction = transaction.objects.create(
+        transaction.objects.create(
             transaction_id=transaction_id,
-            transaction_dt=datetime.strptime(transaction_id[:-6], '%Y%m%d%H%M%S'),
+            transaction_dt=now.replace(microsecond=0),
             user=user,
             total_sale=total,
-            sub_total=round(total - tax_total, 2),
+            sub_total=total - tax_total,
             tax_total=tax_total,
             deposit_total=deposit_total,
             payment_type='STRIPE',
-            receipt='Payment pending...',  # Will be updated after successful payment
-            products=str(cart_df.to_dict('records'))
-        )
-        
-        # Create Stripe PaymentIntent
-        stripe_service = StripePaymentService()
-        intent_data = stripe_service.create_payment_intent(
-            amount=Decimal(str(total)),
-            currency='usd',
-            metadata={'transaction_id': transaction_id}
+            receipt=PENDING_RECEIPT,  # Will be updated after successful payment
+            products=json.dumps(_cart_records(cart), default=str)
         )
         
-        # Link transaction to payment
-        stripe_service.link_transaction_to_payment(new_transaction, intent_data)
-        
-        # Redirect to Stripe payment page
+        # Render the payment page right away; it fetches the PaymentIntent
+        # client secret from stripe_payment_intent, off this request
         return render(request, 'stripe_payment.html', {
-            'client_secret': intent_data['client_secret'],
             'transaction_id': transaction_id,
             'amount': total,
             'STRIPE_PUBLISHABLE_KEY': settings.STRIPE_PUBLISHABLE_KEY
@@ -68,47 +162,62 @@ def start_stripe_payment(request):
         return redirect("register")
 
 
+@login_required(login_url="/user/login/")
+@require_POST
+def stripe_payment_intent(request, transNo):
+    """
+    Create the Stripe PaymentIntent for a pending Stripe transaction and return its client secret.
+    Reloading the payment page reuses the intent already linked to the transaction while Stripe
+    can still confirm it; the transaction row is locked so concurrent loads create only one intent.
+    """
+    with db_transaction.atomic():
+        try:
+            obj = (transaction.objects.select_for_update()
+                   .only('transaction_id', 'payment_type', 'total_sale')
+                   .get(transaction_id=transNo, payment_type='STRIPE'))
+        except transaction.DoesNotExist:
+            raise Http404("No Transaction Found!!!")
+        
+        existing = (PaymentTransaction.objects.filter(transaction=obj, stripe_status__in=STRIPE_REUSABLE_STATUSES)
+                    .exclude(stripe_client_secret__isnull=True).exclude(stripe_client_secret='')
+                    .order_by('-created_at').values_list('stripe_client_secret', flat=True).first())
+        if existing:
+            return JsonResponse({'client_secret': existing})
+        
+        try:
+            # Create Stripe PaymentIntent
+            stripe_service = StripePaymentService()
+            intent_data = stripe_service.create_payment_intent(
+                amount=obj.total_sale,
+                currency='usd',
+                metadata={'transaction_id': obj.transaction_id}
+            )
+            
+            # Link transaction to payment
+            stripe_service.link_transaction_to_payment(obj, intent_data)
+        except Exception as e:
+            print(f"Stripe payment intent error: {e}")
+            return JsonResponse({'error': 'Unable to start Stripe payment'}, status=502)
+    
+    return JsonResponse({'client_secret': intent_data['client_secret']})
+
+
 class DateSelector(forms.Form):
     start_date = forms.DateField(widget = forms.SelectDateWidget())
     end_date = forms.DateField(widget = forms.SelectDateWidget())
 
 
-class printer:
-    printer = None
-
-    def printReceipt(printText,times=0,*args,**kwargs):
-        try:
-            if printer.printer:
-                printer.printer.text(printText)
-                printer.printer.text(f"\nPrint Time: {datetime.now():%Y-%m-%d %H:%M}\n\n\n")
-                # printer.printer.print_and_feed(n=3)
-        except Exception as e: 
-            printer.connectPrinter()
-            if times <3:
-                printer.printReceipt(printText, times+1)
-
-    def connectPrinter():
-        try : printer.printer = Usb(eval(settings.PRINTER_VENDOR_ID),eval(settings.PRINTER_PRODUCT_ID))
-        except Exception as e:
-            print(e)
-            printer.printer = None
-
-
 def transactionReceipt(request,transNo):
     try:
-        receipt = transaction.objects.get(transaction_id=transNo).receipt
+        receipt = _get_receipt(transNo)
         return render(request,'receiptView.html',context={'receipt':receipt, 'transNo': transNo})
     except transaction.DoesNotExist:
         raise Http404("No Transactions Found!!!")
 
 def transactionPrintReceipt(request,transNo):
     try:
-        receipt = transaction.objects.get(transaction_id=transNo).receipt
-        if printer.printer is None:
-            printer.connectPrinter() 
-            print("Connecting Printer")
-        if printer.printer: 
-            printer.printReceipt(receipt)
+        receipt = _get_receipt(transNo)
+        print_receipt(receipt)
         return redirect(f'/transaction_receipt/{transNo}/')
     except Exception as e:
         print(e)
@@ -122,13 +231,23 @@ def transactionView(request, transNo=None):
     form = DateSelector(initial = {'end_date':end_date, 'start_date':start_date})
     if request.method == "POST":
         form = DateSelector(request.POST)
-        if form.is_valid():
-            end_date= form.cleaned_data['end_date']
-            start_date= form.cleaned_data['start_date']
-    transactions = transaction.objects.filter(transaction_dt__date__range = (start_date,end_date)).order_by('-transaction_dt').values('transaction_dt', 'transaction_id','total_sale','payment_type')
+    elif "start_date" in request.GET:
+        # Page links carry the selected range as ISO dates
+        form = DateSelector(request.GET)
+    if form.is_bound and form.is_valid():
+        end_date= form.cleaned_data['end_date']
+        start_date= form.cleaned_data['start_date']
+    # Half-open datetime range so the transaction_dt index can be used (no DATE() cast)
+    start_dt = timezone.make_aware(datetime.combine(start_date, time.min))
+    end_dt = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min))
+    transactions = transaction.objects.filter(transaction_dt__gte = start_dt, transaction_dt__lt = end_dt).order_by('-transaction_dt').values('transaction_dt', 'transaction_id','total_sale','payment_type','user__username')
+    # A newly posted range always starts on its first page
+    page_number = 1 if request.method == "POST" else request.GET.get('page')
+    page = Paginator(transactions, 100).get_page(page_number)
     return render(request, 'transactions.html',
-        context={'transactions':transactions,
-            'form':form,})
+        context={'transactions':page,
+            'form':form,
+            'date_query': urlencode({'start_date': start_date.isoformat(), 'end_date': end_date.isoformat()}),})
 
 
 @login_required(login_url="/user/login/")
@@ -137,15 +256,27 @@ def returnsTransaction(request):
     return redirect('register')
 
 
+def _suspended_scope(request):
+    """
+    Cache namespace for this session's suspended carts. The id lives in the
+    session, so carts stay per terminal like the old session storage and
+    survive the session key rotation on login.
+    """
+    scope = request.session.get(SUSPENDED_SCOPE_SESSION_KEY)
+    if scope is None:
+        scope = request.session[SUSPENDED_SCOPE_SESSION_KEY] = uuid.uuid4().hex
+    return f"suspended:{scope}"
+
+
 @login_required(login_url="/user/login/")
 def suspendTransaction(request):
     if Cart(request).isNotEmpty():
-        if "Cart_Sessions" in request.session.keys():
-            request.session["Cart_Sessions"][datetime.now().strftime('%Y%m%d%H%M%S%f')] = request.session[settings.CART_SESSION_ID]
-            request.session.modified = True
-        else:
-            request.session["Cart_Sessions"] = {}
-            request.session["Cart_Sessions"][datetime.now().strftime('%Y%m%d%H%M%S%f')] = request.session[settings.CART_SESSION_ID] 
+        # Each suspended cart is its own cache entry; the session only keeps their ids
+        scope = _suspended_scope(request)
+        suspend_id = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        caches['suspended_carts'].set(f"{scope}:{suspend_id}", request.session[settings.CART_SESSION_ID],
+                                      settings.SUSPENDED_CART_TIMEOUT)
+        request.session[SUSPENDED_IDS_SESSION_KEY] = request.session.get(SUSPENDED_IDS_SESSION_KEY, []) + [suspend_id]
     return redirect("cart_clear")
 
 
@@ -153,12 +284,25 @@ def suspendTransaction(request):
 def recallTransaction(request, recallTransNo = None):
     if Cart(request).isNotEmpty():
         return redirect("suspend_transaction")
+    suspended = caches['suspended_carts']
+    scope = _suspended_scope(request)
+    ids = request.session.get(SUSPENDED_IDS_SESSION_KEY, [])
     if recallTransNo:
-        request.session[settings.CART_SESSION_ID] = request.session["Cart_Sessions"][recallTransNo]
-        del request.session["Cart_Sessions"][recallTransNo]
-        request.session.modified = True
-    elif "Cart_Sessions" in request.session.keys() and len(request.session["Cart_Sessions"]):
-        return render(request, "recallTransaction.html", context={"obj_rt": request.session["Cart_Sessions"].keys()})
+        if recallTransNo in ids:
+            request.session[SUSPENDED_IDS_SESSION_KEY] = [i for i in ids if i != recallTransNo]
+            cart_key = f"{scope}:{recallTransNo}"
+            cart = suspended.get(cart_key)
+            suspended.delete(cart_key)
+            if cart is not None:
+                request.session[settings.CART_SESSION_ID] = cart
+    elif ids:
+        # Carts can expire before their id leaves the session; list only live ones
+        live = suspended.get_many([f"{scope}:{suspend_id}" for suspend_id in ids])
+        recall_ids = [suspend_id for suspend_id in ids if f"{scope}:{suspend_id}" in live]
+        if len(recall_ids) != len(ids):
+            request.session[SUSPENDED_IDS_SESSION_KEY] = recall_ids
+        if recall_ids:
+            return render(request, "recallTransaction.html", context={"obj_rt": recall_ids})
     return redirect("register")
 
 
@@ -167,39 +311,13 @@ def endTransactionReceipt(request,transNo):
     try:
         if request.GET["type"]=="cash":
             change = float(request.GET["value"]) - float(request.GET["total"])
-            change = f"""<table class="table text-white h3 p-0 m-0"> 
-                            <tr> 
-                                <td class="text-left pl-5"> Total : </td> 
-                                <td class="text-right pr-5"> {request.GET["total"]} $</td> 
-                            </tr> 
-                            <tr> 
-                                <td class="text-left pl-5"> Cash : </td> 
-                                <td class="text-right pr-5"> {request.GET["value"]} $</td> 
-                            </tr> 
-                            <tr class="h1 badge-danger" >  
-                                <td style="padding-top:15px"> Change : </td> 
-                                <td style="padding-top:15px"> {change*(-1):.2f} $</td> 
-                            </tr> 
-                        </table>"""
+            change = render_to_string('partials/_change_cash.html', {
+                'total': request.GET["total"], 'value': request.GET["value"], 'change': change*(-1)})
         elif request.GET["type"]=="card":
-            change = f"""<table class="table text-white h3 p-0 m-0"> 
-                            <tr> 
-                                <td class="text-left pl-5"> Total : </td> 
-                                <td class="text-right pr-5"> {request.GET["total"]} $</td> 
-                            </tr> 
-                            <tr> 
-                                <td class="text-left pl-5"> Card : </td> 
-                                <td class="text-right pr-5"> {request.GET["value"]}</td> 
-                            </tr> 
-                            
-                        </table>
-                        <div class="h1 badge-danger p-3" >  
-                                 CARD TRANSACTION 
-                            </div> 
-                            """
+            change = render_to_string('partials/_change_card.html', {
+                'total': request.GET["total"], 'value': request.GET["value"]})
         
-        obj = transaction.objects.get(transaction_id=transNo)
-        return render(request,'endTransaction.html',context={'receipt':obj.receipt,'change':change})
+        return render(request,'endTransaction.html',context={'receipt':_get_receipt(transNo),'change':change})
     except transaction.DoesNotExist:
         raise Http404("No Transactions Found!!!")
 
@@ -208,45 +326,41 @@ def endTransactionReceipt(request,transNo):
 def complete_stripe_payment(request, transNo):
     """
     Complete a Stripe payment and update the transaction receipt.
+    The payment status is kept current by the Stripe webhook, so this only reads the database.
     """
     try:
-        obj = transaction.objects.get(transaction_id=transNo)
+        # Only the columns the status check and generate_stripe_receipt read
+        obj = transaction.objects.only(
+            'transaction_id', 'payment_type', 'total_sale', 'sub_total', 'tax_total', 'receipt', 'products'
+        ).get(transaction_id=transNo)
         if obj.payment_type == 'STRIPE':
-            # Check payment status and update receipt if payment succeeded
-            stripe_service = StripePaymentService()
-            stripe_service.update_transaction_payment_status(obj)
+            payment_status = obj.stripe_payment_status
             
             # If payment succeeded, generate complete receipt
-            if obj.stripe_payment_status == 'succeeded':
+            if payment_status == 'succeeded':
                 # Generate proper receipt for Stripe payment
                 obj.receipt = generate_stripe_receipt(obj)
-                obj.save()
+                # Single-column UPDATE; transaction.save() would re-localize
+                # transaction_dt and re-create the product rows
+                transaction.objects.filter(pk=obj.pk).update(receipt=obj.receipt)
+                cache.set(_receipt_cache_key(obj.transaction_id), obj.receipt, RECEIPT_CACHE_TIMEOUT)
                 
                 # Clear the cart
                 Cart(request).clear()
                 
-                change = f"""<table class="table text-white h3 p-0 m-0"> 
-                            <tr> 
-                                <td class="text-left pl-5"> Total : </td> 
-                                <td class="text-right pr-5"> {obj.total_sale} $</td> 
-                            </tr> 
-                            <tr> 
-                                <td class="text-left pl-5"> Stripe Payment : </td> 
-                                <td class="text-right pr-5"> COMPLETED</td> 
-                            </tr> 
-                        </table>
-                        <div class="h1 badge-success p-3" >  
-                                 STRIPE PAYMENT SUCCESSFUL 
-                            </div>"""
+                change = render_to_string('partials/_change_stripe.html', {'total': obj.total_sale})
                             
                 return render(request, 'endTransaction.html', {
                     'receipt': obj.receipt, 
                     'change': change,
                     'transaction': obj
                 })
-            else:
+            elif _stripe_payment_failed(obj, payment_status):
                 # Payment failed
                 return render(request, 'stripe_payment_failed.html', {'transaction': obj})
+            else:
+                # Webhook not received yet; the page polls stripe_payment_status
+                return render(request, 'stripe_payment_pending.html', {'transaction': obj})
         else:
             raise Http404("Transaction not found or not a Stripe payment")
             
@@ -254,32 +368,35 @@ def complete_stripe_payment(request, transNo):
         raise Http404("No Transaction Found!!!")
 
 
+@login_required(login_url="/user/login/")
+def stripe_payment_status(request, transNo):
+    """Return the webhook-maintained Stripe payment status of a transaction as JSON."""
+    try:
+        obj = transaction.objects.only('transaction_id', 'payment_type').get(
+            transaction_id=transNo, payment_type='STRIPE')
+    except transaction.DoesNotExist:
+        raise Http404("No Transaction Found!!!")
+    status = obj.stripe_payment_status
+    return JsonResponse({'status': status, 'final': status == 'succeeded' or _stripe_payment_failed(obj, status)})
+
+
 def generate_stripe_receipt(transaction_obj):
     """
     Generate a proper receipt for a Stripe payment transaction.
     """
-    cart_df = pd.DataFrame(eval(transaction_obj.products)).reset_index(drop=True)
-    cart_df.index = cart_df.index + 1
-    
-    cart_df["tax"] = cart_df["tax_value"].astype(float).apply(lambda x: "T" if x>0 else "-T" if x<0 else "")
-    cart_df["deposit"] = cart_df["deposit_value"].astype(float).apply(lambda x: "" if x==0.00 else x)
-    
     # Building Receipt
-    cart_string = "\n".join(list(cart_df.apply(
-        lambda row: f"{str(row.name)+')':<3} {row['name'][:28]}".ljust(settings.RECEIPT_CHAR_COUNT)+ "\n"+
-                    f" {row['barcode']:<13}{row['quantity']:>3}{row['price']:>7}{row['deposit']:>6}{row['tax']:>2}".rjust(settings.RECEIPT_CHAR_COUNT),axis=1)))
-    cart_string = "NAME | BARCODE QTY PRICE DP TAX".rjust(settings.RECEIPT_CHAR_COUNT) + f"\n{'-'*settings.RECEIPT_CHAR_COUNT}\n" + cart_string
+    W = settings.RECEIPT_CHAR_COUNT
+    cart_string = _receipt_items(transaction_obj.product_list())
+    cart_string = "NAME | BARCODE QTY PRICE DP TAX".rjust(W) + f"\n{'-'*W}\n" + cart_string
     
-    cart_string = f"Transaction:{transaction_obj.transaction_id}".center(settings.RECEIPT_CHAR_COUNT) + f"\n{'-'*int(settings.RECEIPT_CHAR_COUNT)}\n" + cart_string
+    cart_string = f"Transaction:{transaction_obj.transaction_id}".center(W) + f"\n{'-'*W}\n" + cart_string
     
-    total_string = f"Sub-Total: {transaction_obj.sub_total}  Tax-Total: {transaction_obj.tax_total}".center(settings.RECEIPT_CHAR_COUNT)
-    total_string = total_string + "\n" + (' - '*int(settings.RECEIPT_CHAR_COUNT/3)) +"\n" + f"{'TOTAL SALE':>10}: {transaction_obj.total_sale}".rjust(settings.RECEIPT_CHAR_COUNT)
-    total_string = total_string + "\n" + f"{'STRIPE':>10}: $ {transaction_obj.total_sale:.2f}".rjust(settings.RECEIPT_CHAR_COUNT)
-    total_string = total_string + "\n" + f"{'STATUS':>10}: PAID".rjust(settings.RECEIPT_CHAR_COUNT)
+    total_string = f"Sub-Total: {transaction_obj.sub_total}  Tax-Total: {transaction_obj.tax_total}".center(W)
+    total_string = total_string + "\n" + (' - '*(W//3)) +"\n" + f"{'TOTAL SALE':>10}: {transaction_obj.total_sale}".rjust(W)
+    total_string = total_string + "\n" + f"{'STRIPE':>10}: $ {transaction_obj.total_sale:.2f}".rjust(W)
+    total_string = total_string + "\n" + f"{'STATUS':>10}: PAID".rjust(W)
 
-    receipt = settings.RECEIPT_HEADER+ "\n\n" +cart_string+ f"\n{'-'*settings.RECEIPT_CHAR_COUNT}\n{total_string}"+"\n\n" + settings.RECEIPT_FOOTER
-    
-    receipt = "\n".join([i.center(settings.RECEIPT_CHAR_COUNT) for i in receipt.splitlines()])
+    receipt = _center_receipt(cart_string + f"\n{'-'*W}\n{total_string}")
     
     return receipt
 
@@ -289,7 +406,7 @@ def endTransaction(request,type,value):
     try:
         return_transaction = None
         cart = request.session[settings.CART_SESSION_ID]
-        total = round(pd.DataFrame(cart).T["line_total"].astype(float).sum(),2)
+        total, _, _ = _cart_totals(cart)
         if type == "card":
             if value=="EBT": 
                 return_transaction = addTransaction(request.user,"EBT",total,cart,total)
@@ -299,7 +416,7 @@ def endTransaction(request,type,value):
                 # Redirect to Stripe payment initiation
                 return redirect('start_stripe_payment')
         elif type=="cash":
-            value = round(float(value),2)
+            value = Decimal(value).quantize(CENT)
             if value>= total: 
                 return_transaction = addTransaction(request.user,"CASH",total,cart,value)
         if return_transaction:
@@ -312,39 +429,36 @@ def endTransaction(request,type,value):
 
 
 def addTransaction(user,payment_type,total,cart,value):
-    transaction_id = datetime.now().strftime('%Y%m%d%H%M%S%f')
-    cart_df = pd.DataFrame(cart).T.reset_index(drop=True)
-    cart_df.index = cart_df.index + 1
-    tax_total = round(cart_df["tax_value"].astype(float).sum(),2)
-    deposit_total = round(cart_df["deposit_value"].astype(float).sum(),2)
-    cart_df["tax"] = cart_df["tax_value"].astype(float).apply(lambda x: "T" if x>0 else "-T" if x<0 else "")
-    cart_df["deposit"] = cart_df["deposit_value"].astype(float).apply(lambda x: "" if x==0.00 else x )
+    now = datetime.now()
+    transaction_id = now.strftime('%Y%m%d%H%M%S%f')
+    _, tax_total, deposit_total = _cart_totals(cart)
     
     # Building Receipt
-    cart_string =  "\n".join(list(cart_df.apply(
-                            lambda row: f"{str(row.name)+')':<3} {row['name'][:28]}".ljust(settings.RECEIPT_CHAR_COUNT)+ "\n"+
-                                            f" {row['barcode']:<13}{row['quantity']:>3}{row['price']:>7}{row['deposit']:>6}{row['tax']:>2}".rjust(settings.RECEIPT_CHAR_COUNT),axis=1)))
-    cart_string = "NAME | BARCODE QTY PRICE DP TAX".rjust(settings.RECEIPT_CHAR_COUNT) + f"\n{'-'*settings.RECEIPT_CHAR_COUNT}\n" + cart_string
+    W = settings.RECEIPT_CHAR_COUNT
+    records = _cart_records(cart)
+    cart_string = _receipt_items(records)
+    cart_string = "NAME | BARCODE QTY PRICE DP TAX".rjust(W) + f"\n{'-'*W}\n" + cart_string
     
-    cart_string = f"Transaction:{transaction_id}".center(settings.RECEIPT_CHAR_COUNT) + f"\n{'-'*int(settings.RECEIPT_CHAR_COUNT)}\n" + cart_string
+    cart_string = f"Transaction:{transaction_id}".center(W) + f"\n{'-'*W}\n" + cart_string
     
-    total_string = f"Sub-Total: {round(total-tax_total,2)}  Tax-Total: {round(tax_total,2)}".center(settings.RECEIPT_CHAR_COUNT)
-    total_string = total_string + "\n" + (' - '*int(settings.RECEIPT_CHAR_COUNT/3)) +"\n" + f"{'TOTAL SALE':>10}: {round(total,2)}".rjust(settings.RECEIPT_CHAR_COUNT)
-    total_string = total_string + "\n" + f"{str(payment_type):>10}: $ {round(value,2):.2f}".rjust(settings.RECEIPT_CHAR_COUNT)
-    total_string = total_string + "\n" + f"{'CHANGE':>10}: $ {round(value-total,2):.2f}".rjust(settings.RECEIPT_CHAR_COUNT)
+    total_string = f"Sub-Total: {round(total-tax_total,2)}  Tax-Total: {round(tax_total,2)}".center(W)
+    total_string = total_string + "\n" + (' - '*(W//3)) +"\n" + f"{'TOTAL SALE':>10}: {round(total,2)}".rjust(W)
+    total_string = total_string + "\n" + f"{str(payment_type):>10}: $ {round(value,2):.2f}".rjust(W)
+    total_string = total_string + "\n" + f"{'CHANGE':>10}: $ {round(value-total,2):.2f}".rjust(W)
 
-    receipt = settings.RECEIPT_HEADER+ "\n\n" +cart_string+ f"\n{'-'*settings.RECEIPT_CHAR_COUNT}\n{total_string}"+"\n\n" + settings.RECEIPT_FOOTER
+    receipt = _center_receipt(cart_string + f"\n{'-'*W}\n{total_string}")
     # receipt = settings.RECEIPT_HEADER+f"\n{'*'*int(settings.RECEIPT_CHAR_COUNT)}\n" +cart_string+ f"\n{'-'*settings.RECEIPT_CHAR_COUNT}\n{total_string}"+f"\n{'*'*int(settings.RECEIPT_CHAR_COUNT)}\n" + settings.RECEIPT_FOOTER
     
-    receipt = "\n".join([i.center(settings.RECEIPT_CHAR_COUNT) for i in receipt.splitlines()])
-    
     ## IF CASH DRAWER Connected uncomment below
-    # if printer.printer and settings.CASH_DRAWER: 
-    #     try: printer.printer.cashdraw(2)
+    # if printing._device and settings.CASH_DRAWER: 
+    #     try: printing._device.cashdraw(2)
     #     except: pass
 
     #Saving Transaction into Database
-    return transaction.objects.create( transaction_id = transaction_id , transaction_dt = datetime.strptime(transaction_id[:-6],'%Y%m%d%H%M%S'),
+    new_transaction = transaction.objects.create( transaction_id = transaction_id , transaction_dt = now.replace(microsecond=0),
             user = user, total_sale= total, sub_total = round(total-tax_total,2),tax_total=tax_total, deposit_total = deposit_total,
-            payment_type = payment_type, receipt = receipt, products = str(cart_df.to_dict('records')),
+            payment_type = payment_type, receipt = receipt, products = json.dumps(records, default=str),
         )
+    # Warm the cache for the end-of-transaction screen and any reprint
+    cache.set(_receipt_cache_key(transaction_id), receipt, RECEIPT_CACHE_TIMEOUT)
+    return new_transaction